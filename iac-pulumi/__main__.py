@@ -14,6 +14,7 @@ stack_name = pulumi.get_stack()
 vpc_name = config.require("vpcName")
 vpc_cidr_block = config.require("vpcCIDRBlock")
 subnet_count = int(config.get("subnetCount") or 2)
+db_read_replica = config.get_bool("dbReadReplica") or False
 cidr_base = config.require("cidrBase")
 aws_profile_name = config.require("profile")
 key_pair_name = config.require("KeyPairName")
@@ -374,9 +375,29 @@ rds_instance = rds.Instance(
     db_subnet_group_name=db_subnet_group.name,
     multi_az=False,
     publicly_accessible=False,
+    # RDS only creates read replicas of instances with automated backups
+    backup_retention_period=1 if db_read_replica else None,
     tags={"Name", "csye6225-db-instance"}
 )
 
+# Optional read replica, serves the webapp's read-only routes and health checks
+if db_read_replica:
+    rds_replica = rds.Instance(
+        "csye6255-db-replica",
+        replicate_source_db=rds_instance.identifier,
+        instance_class="db.t3.micro",
+        storage_type="gp2",
+        skip_final_snapshot=True,
+        parameter_group_name=parameter_group.name,
+        vpc_security_group_ids=[db_security_group.id],
+        multi_az=False,
+        publicly_accessible=False,
+        tags={"Name": "csye6225-db-replica"}
+    )
+    replica_endpoint = rds_replica.endpoint
+else:
+    replica_endpoint = pulumi.Output.from_input("")
+
 # IAM Role for EC2 Instance
 ec2_role = aws.iam.Role(
     "ec2Role",
@@ -444,7 +465,8 @@ write_files:
       DATABASE_USER={database_user}
       DATABASE_PASSWORD={database_password}
       DATABASE_NAME={database_name}
-      SNS_TOPIC_ARN={sns_top_arn}
+      DATABASE_REPLICA_HOST={database_replica_host}
+      SNS_TOPIC_ARN={sns_topic_arn}
       AWS_PROFILE_NAME={aws_profile_name}
 
 runcmd:
@@ -463,8 +485,10 @@ runcmd:
 def format_user_data(args):
     # Split endpoint into host and port
     host, port = args[0].split(":")
+    replica_host = args[5].split(":")[0] if args[5] else ""
     return user_data_script.format(
         database_host=host,
+        database_replica_host=replica_host,
         database_user = args[1],
         database_password=args[2],
         database_name="healthcheck",
@@ -474,11 +498,11 @@ def format_user_data(args):
 
 
 def encode_user_data(user_data):
-    return base64.b64decode(user_data.encode()).decode()
+    return base64.b64encode(user_data.encode()).decode()
 
 
 formatted_user_data = pulumi.Output.all(
-    rds_instance.endpoint, db_username, db_password, sns_topic.arn, aws_profile_name
+    rds_instance.endpoint, db_username, db_password, sns_topic.arn, aws_profile_name, replica_endpoint
 ).apply(format_user_data)
 encoded_user_data = formatted_user_data.apply(encode_user_data)
 
@@ -636,4 +660,5 @@ pulumi.export("amiId", pulumi.Output.from_input(ami).apply(lambda ami: ami.id))
 # Export the name and ARN of the topic
 pulumi.export("snsTopicName", sns_topic.name)
 pulumi.export("snsTopicArn", sns_topic.arn)
+pulumi.export("dbReplicaEndpoint", replica_endpoint)
 
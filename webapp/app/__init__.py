@@ -1,41 +1,128 @@
-from flask import Flask, request, abort
+from flask import Flask, request, abort, g, url_for
 from config import Config
-from flask_migrate import Migrate
-from app.extension import logger, statsd, db, bcrpyt, publish_to_sns
-from sqlalchemy import text
+from app.extension import (
+    logger,
+    setup_logging,
+    statsd,
+    db,
+    bcrpyt,
+    credential_cache,
+    hashing_pool,
+    assignment_cache,
+    health_prober,
+    outbox_dispatcher,
+    request_metrics,
+    response_compressor,
+    sql_profiler,
+    replica_router,
+    publish_to_sns)
+from app import extension, green
+from app.boot import BootMarker, BootTimer, create_schema
+from app.hashing import HashPoolSaturated
+from app.health import pool_stats
+from app.pool import engine_options
+from app.serializers import FastJSONProvider, row_serializer
 from uuid import uuid4
 from app.helper_func import create_response
+from sqlalchemy import insert, select
 from sqlalchemy.exc import SQLAlchemyError
 from functools import wraps
-from app.models import User, Assignment, Submission
+from app.models import User, Assignment, Submission, SubmissionAttempt, CollectionVersion
+from app.schema import ASSIGNMENT_SCHEMA, SUBMISSION_SCHEMA, describe
+from app.seeding import load_users_from_csv
+from app.conditional import (
+    assignment_etag,
+    fetch_assignment_etag,
+    fetch_collection_etag,
+    is_not_modified)
+from app.pagination import (
+    ASSIGNMENT_FIELDS,
+    decode_cursor,
+    fetch_assignment_page,
+    iter_assignments,
+    parse_fields,
+    parse_limit)
 from datetime import datetime
 from app.helper_func import (
     is_valid_email, 
     is_valid_password, 
-    load_users_from_csv,
-    validate_datetime_format, 
-    create_response)
+    create_response,
+    create_stream_response)
 
 
 def create_app(config_class=Config):
-    app = Flask(__name__)
-    app.config.from_object(config_class)
-
-    logger.info('Flask app "MyFlaskApp starting up.')
-    logger.info("Using config: %s", config_class)
-
-
-    db.init_app(app)
-    bcrpyt.init_app(app)
-
-    Migrate(app, db)
-
+    boot = BootTimer()
+    with boot.phase("config"):
+        setup_logging()
+        app = Flask(__name__)
+        app.config.from_object(config_class)
+        app.json = FastJSONProvider(app)
+
+        logger.info('Flask app "MyFlaskApp starting up.')
+        logger.info("Using config: %s", config_class)
+
+    with boot.phase("db_init"):
+        serving_mode = app.config.get("SERVING_MODE", "sync")
+        if serving_mode == "gevent":
+            green.enable(hashing_pool)
+        elif serving_mode == "sync":
+            green.check_sync_mode()
+        else:
+            raise ValueError(f"Unknown SERVING_MODE: {serving_mode}")
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
+        db.init_app(app)
+        replica_router.init_app(app)
+        bcrpyt.init_app(app)
+        credential_cache.init_app(app)
+        hashing_pool.init_app(app)
+        assignment_cache.init_app(app)
+        health_prober.init_app(app)
+        outbox_dispatcher.init_app(app)
+        request_metrics.init_app(app)
+        # Registered after the metrics hook so it runs first, sizes are on the wire
+        response_compressor.init_app(app)
+        sql_profiler.init_app(app)
+
+        # alembic is the heaviest import, only apps that get created pay for it
+        from flask_migrate import Migrate
+        migrate = Migrate(app, db)
+
+    # Fast boot: a database stamped at the migration head needs no schema
+    # work, and a seed file already loaded on this host no reseed. An empty
+    # database is built and stamped here, older ones are migrated by upgrade.py
     with app.app_context():
-        db.create_all()
-        load_users_from_csv()
+        with boot.phase("migrations"):
+            marker = BootMarker(app.config["BOOT_MARKER_PATH"], migrate.directory)
+            schema_current = marker.schema_is_current(db)
+            if not schema_current and not create_schema(db, migrate.directory):
+                logger.warning(
+                    "Database is not at migration head %s, run python upgrade.py",
+                    marker.head_revision(),
+                )
+            fast_boot = app.config.get("BOOT_MODE") == "fast" and schema_current
+
+        with boot.phase("seed"):
+            if not (fast_boot and marker.seed_is_current("login.csv")):
+                load_users_from_csv()
+                if fast_boot:
+                    marker.record_seed("login.csv")
         logger.info("Connected to database successfully.")
+
+    app.extensions["boot_timings"] = boot.report(statsd)
     logger.info("Flask app ready to serve requests .")
 
+    # Every worker drains messages left over from before it started
+    @app.before_request
+    def start_outbox_dispatcher():
+        outbox_dispatcher.start()
+
+    @app.errorhandler(HashPoolSaturated)
+    def hash_pool_saturated(error):
+        logger.warning("Rejecting request: %s", error)
+        response = create_response(503)
+        response.headers["Retry-After"] = "1"
+        return response
+
     # API Implementation
     def basic_auth_required(fn):
         @wraps(fn)
@@ -51,120 +138,246 @@ def create_app(config_class=Config):
             if not is_valid_password(auth.password):
                 abort(401, description = "Invalid Email!!")
 
-            try:
-                user = User.query.filter_by(email = auth.username).first()
-            except SQLAlchemyError:
-                abort(503, description="Connection database not successful!!")
-            
-            if not user or not user.verify_password(auth.password):
+            user_id = authenticate(auth.username, auth.password)
+            if user_id is None:
                 abort(401, description= "Invalid email or password!!")
 
+            # Resolved once per request, routes read the principal from g
+            g.user_id = user_id
+            g.user_email = auth.username
+
             return fn(*args, **kwargs)
         return wrapper
+
+    def authenticate(email, password):
+        """Return the user id for valid credentials, skipping bcrypt on cache hits"""
+        user_id = credential_cache.get(email, password)
+        if user_id is not None:
+            statsd.incr("auth.cache.hit")
+            return user_id
+        statsd.incr("auth.cache.miss")
+
+        try:
+            user = User.query.filter_by(email = email).first()
+        except SQLAlchemyError:
+            abort(503, description="Connection database not successful!!")
+
+        if not user or not user.verify_password(password):
+            return None
+
+        credential_cache.set(email, password, user.id)
+        return user.id
     
-    # Health check API
+    # Health check API, served from the background prober's last result
     @app.route("/healthz", methods=["GET"])
     def health_check():
         if request.data or request.args:
             abort(400, description="Request body must be empty")
-        try:
-            db.session.execute(text("SELECT * FROM user;"))
-            return create_response(200)
-        except SQLAlchemyError:
+        if not health_prober.status()["healthy"]:
             abort(503, description="Database connection error")
+        return create_response(200)
+
+    # Deep health check, live round trip plus connection pool state
+    @app.route("/healthz/deep", methods=["GET"])
+    def deep_health_check():
+        if request.data or request.args:
+            abort(400, description="Request body must be empty")
+        status = health_prober.probe()
+        body = {
+            "database": {
+                "healthy": status["healthy"],
+                "error": status["error"],
+                "latency_ms": status["latency_ms"],
+            },
+            "pool": pool_stats(db.engine),
+            "logging": extension.log_pipeline.stats() if extension.log_pipeline else None,
+            "boot": app.extensions.get("boot_timings"),
+        }
+        if health_prober.bind_key is not None:
+            replica = status["replica"]
+            body["replica"] = {
+                "healthy": replica["healthy"],
+                "error": replica["error"],
+                "latency_ms": replica["latency_ms"],
+                "pool": pool_stats(db.engines[health_prober.bind_key]),
+            }
+        return create_response(200 if status["healthy"] else 503, body)
     
     def get_user_id_from_basic_auth():
-        auth = request.authorization
-        if not auth:
-            return None
-    
-        user = User.query.filter_by(email=auth.username).first()
-        if not user or not user.verify_password(auth.password):
-            return None
-        return user.id
+        return g.get("user_id")
     
     def get_email_from_basic_auth():
-        auth = request.authorization
-
-        if not auth:
-            return None
-        return auth.username
+        return g.get("user_email")
+
+    def load_assignment_snapshot(ass_id):
+        # Cache fills come from the primary: a lagging replica's row would be
+        # served to every worker sharing the cache until the TTL
+        with replica_router.primary():
+            assignment = db.session.get(Assignment, ass_id)
+        return assignment.snapshot() if assignment else None
+
+    def get_assignment_snapshot(ass_id):
+        """Cached assignment snapshot, 404 when the assignment does not exist"""
+        snapshot = assignment_cache.get(ass_id, load_assignment_snapshot)
+        if snapshot is None:
+            abort(404)
+        return snapshot
     
     # Get All Assignment
     @app.route("/v1/assignments", methods=["GET"])
+    @replica_router.read_only
     @basic_auth_required
     def get_assignments():
-        statsd.incr(".assignments.get")
-        assignments = Assignment.query.all()
+        try:
+            limit = parse_limit(
+                request.args.get("limit"),
+                app.config["ASSIGNMENTS_PAGE_SIZE"],
+                app.config["ASSIGNMENTS_MAX_PAGE_SIZE"],
+            )
+            fields = parse_fields(request.args.get("fields"))
+            cursor = request.args.get("cursor")
+            cursor = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            abort(400, description = str(e))
+
+        # Version is read before the rows, so a racing write only costs a refetch
+        etag = fetch_collection_etag(request.query_string.decode("utf-8"))
+        if is_not_modified(etag):
+            return create_response(304, etag = etag)
+
+        # Full export, rows are streamed straight from the DB cursor
+        if request.args.get("stream", "").lower() in ("1", "true"):
+            logger.info("Streaming assignments")
+            return create_stream_response(
+                200,
+                iter_assignments(
+                    fields, cursor, app.config["ASSIGNMENTS_STREAM_BATCH_SIZE"]
+                ),
+                etag = etag,
+            )
+
+        assignments, next_cursor = fetch_assignment_page(fields, limit, cursor)
         logger.info("Assignments retrieved successfully!!")
-        return create_response(
-            200, [assignment.serialize() for assignment in assignments]
-        )
+
+        response = create_response(200, assignments, etag = etag)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+            next_url = url_for(
+                "get_assignments", **{**request.args.to_dict(), "cursor": next_cursor}
+            )
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return response
     
     # Get Specific Assignment 
     @app.route("/v1/assignments/<string:ass_id>", methods=["GET"])
+    @replica_router.read_only
     @basic_auth_required
     def get_assignment(ass_id):
-        statsd.incr(".assignments.get")
-        assignment = Assignment.query.get_or_404(ass_id)
+        if request.if_none_match and assignment_cache.backend is None:
+            # Answer revalidations from the version column alone
+            etag = fetch_assignment_etag(ass_id)
+            if etag is None:
+                abort(404)
+            if is_not_modified(etag):
+                return create_response(304, etag = etag)
+
+        assignment = get_assignment_snapshot(ass_id)["assignment"]
+        etag = assignment_etag(ass_id, assignment["assignment_updated"])
+        if is_not_modified(etag):
+            return create_response(304, etag = etag)
+
         logger.info("Assignment retrieved successfully")
-        return create_response(200, assignment.serialize())
+        return create_response(200, assignment, etag = etag)
 
     # Assignment Create
     @app.route("/v1/assignments", methods=["POST"])
     @basic_auth_required
     def create_assignment():
-        statsd.incr(".assignments.create")
         data = request.get_json()
         if not data:
             abort(400, description = "Request body must be present")
-        name = data.get("name")
-        points = data.get("points")
-        number_of_attempts = data.get("number_of_attempts")
-        deadline = data.get("deadline")
-
-        if not all([name, points, number_of_attempts, deadline]):
-            abort(400, description = "Missing required fields")
 
-        if not (1 <= points <= 100):
-            abort(400, description = "Points must between 1 and 100")
-
-        if not (1 <= number_of_attempts <= 100):
-            abort(400, description = "No of attempts must between 1 and 100")
-
-        try:
-            valid_flag, processed_deadline = validate_datetime_format(deadline)
-        
-            if not valid_flag:
-                abort(400, description = "Invalid Deadline format")
-            
-        except ValueError:
-            abort(400, description = "Invalid Deadline format")
+        values, errors = ASSIGNMENT_SCHEMA.validate(data)
+        if errors:
+            abort(400, description = describe(errors))
         
         current_user_id = get_user_id_from_basic_auth()
         assignment = Assignment(
             id = str(uuid4()),
-            name = name,
-            points = points,
-            number_of_attempts = number_of_attempts,
-            deadline = processed_deadline,
-            created_by = current_user_id
+            created_by = current_user_id,
+            **values
         )
 
-        assignment.assignment_updated = datetime.utcnow().strftime(
-            "%Y-%m-%dT%H:%M:%S.%fZ"
-        )
+        assignment.assignment_updated = datetime.utcnow()
 
         db.session.add(assignment)
+        CollectionVersion.bump("assignment")
         db.session.commit()
+        assignment_cache.invalidate(assignment.id)
         logger.info("Assignment created successfully")
         return create_response(201, assignment.serialize())
 
+    # Bulk Assignment Create
+    @app.route("/v1/assignments/bulk", methods=["POST"])
+    @basic_auth_required
+    def create_assignments_bulk():
+        data = request.get_json()
+        if not isinstance(data, list) or not data:
+            abort(400, description = "Request body must be a non-empty array")
+        if len(data) > app.config["ASSIGNMENTS_BULK_MAX"]:
+            abort(400, description = f"At most {app.config['ASSIGNMENTS_BULK_MAX']} assignments per request")
+
+        mode = request.args.get("mode", "atomic")
+        if mode not in ("atomic", "partial"):
+            abort(400, description = "mode must be atomic or partial")
+
+        # Validate everything first, nothing is written for an invalid atomic batch
+        results = []
+        rows = []
+        now = datetime.utcnow()
+        current_user_id = get_user_id_from_basic_auth()
+        for index, item in enumerate(data):
+            values, errors = ASSIGNMENT_SCHEMA.validate(item)
+            if errors:
+                results.append({"index": index, "status": 400, "error": describe(errors), "errors": errors})
+                continue
+            row = {
+                "id": str(uuid4()),
+                "created_by": current_user_id,
+                "assignment_created": now,
+                "assignment_updated": now,
+                **values
+            }
+            rows.append(row)
+            results.append({"index": index, "status": 201, "row": row})
+
+        failed = len(data) - len(rows)
+        if failed and mode == "atomic":
+            for result in results:
+                if result["status"] == 201:
+                    result.pop("row")
+                    result["status"] = 424
+            return create_response(400, results)
+
+        if rows:
+            # One multi-row INSERT in one transaction
+            db.session.execute(insert(Assignment).values(rows))
+            CollectionVersion.bump("assignment")
+            db.session.commit()
+
+        serialize = row_serializer(Assignment, ASSIGNMENT_FIELDS)
+        for result in results:
+            row = result.pop("row", None)
+            if row is not None:
+                result["assignment"] = serialize(tuple(row[f] for f in ASSIGNMENT_FIELDS))
+
+        logger.info("Bulk created %s assignments, %s rejected", len(rows), failed)
+        return create_response(207 if failed else 201, results)
+
     # update Assignment
     @app.route("/v1/assignments/<string:ass_id>", methods= ['PUT'])
     @basic_auth_required
     def update_assignment(ass_id):
-        statsd.incr(".assignments.update")
         assignment = Assignment.query.get_or_404(ass_id)
         user_id = get_user_id_from_basic_auth()
 
@@ -173,29 +386,19 @@ def create_app(config_class=Config):
         
         data = request.get_json()
 
-        neccessary_args = ["name", "points", "number_of_attempts", "deadline"]
-        for arg in neccessary_args:
-            if not data.get(arg) or data[arg] == "":
-                abort(400, description = "Missing required Fields")
-
-        
-        assignment.name = data["name"]
-        assignment.points = data["points"]
-        assignment.number_of_attempts = data["number_of_attempts"]
-        assignment.deadline = data["deadline"]
-
-        try:
-            valid_flag, processed_deadline = validate_datetime_format(data["deadline"])
-            if not valid_flag:
-                abort(400, description = "Invalid Date Format")
-                assignment.deadline = processed_deadline
-        except ValueError:
-            abort(400, description = "Invalid Date Format")
-
-        assignment.assignment_updated = datetime.utcnow().strftime(
-            "%Y-%m-%dT%H:%M:%S.%fZ"
-        )
+        # Same schema as create, nothing is assigned until every field is valid
+        values, errors = ASSIGNMENT_SCHEMA.validate(data)
+        if errors:
+            abort(400, description = describe(errors))
+
+        assignment.name = values["name"]
+        assignment.points = values["points"]
+        assignment.number_of_attempts = values["number_of_attempts"]
+        assignment.deadline = values["deadline"]
+        assignment.assignment_updated = datetime.utcnow()
+        CollectionVersion.bump("assignment")
         db.session.commit()
+        assignment_cache.invalidate(ass_id)
         logger.info("Assignment Updated Successfully")
 
         return create_response(204)
@@ -205,7 +408,6 @@ def create_app(config_class=Config):
     @app.route("/v1/assignments/<string:ass_id>", methods = ['DELETE'])
     @basic_auth_required
     def delete_assignment(ass_id):
-        statsd.incr(".assignments.delete")
         if request.data or request.args:
             abort(400, description = "Request body must be empty")
         assignment = Assignment.query.get_or_404(ass_id)
@@ -214,11 +416,14 @@ def create_app(config_class=Config):
         if assignment.created_by != user_id:
             abort(403, description="Forbidden: you do not have permission to delete assignment")
         
-        # Delete all related Submissions first
+        # Delete all related Submissions and attempt counters first
         Submission.query.filter_by(assignment_id=ass_id).delete()
+        SubmissionAttempt.query.filter_by(assignment_id=ass_id).delete()
 
         db.session.delete(assignment)
+        CollectionVersion.bump("assignment")
         db.session.commit()
+        assignment_cache.invalidate(ass_id)
 
         logger.info("Assignment Deleted Successfully")
         return create_response(204)
@@ -228,49 +433,56 @@ def create_app(config_class=Config):
     @app.route("/v1/assigments/<string:ass_id>/submission", methods=['POST'])
     @basic_auth_required
     def create_submission(ass_id):
-        statsd.incr(".submission.create")
         data = request.get_json()
         if not data:
             abort(400, description= "Request body must be present")
-        
-        assignment = Assignment.query.get_or_404(ass_id)
-        submission_url = data.get("submission_url")
 
-        if not submission_url:
-            abort(400, description="Missing required fileds")
+        # Deadline and attempt limit from the row, never from the assignment
+        # cache: another worker's local copy can be up to its TTL stale.
+        # FOR SHARE holds off a concurrent update or delete until commit
+        assignment = db.session.execute(
+            select(Assignment.name, Assignment.deadline, Assignment.number_of_attempts)
+            .where(Assignment.id == ass_id)
+            .with_for_update(read = True)
+        ).first()
+        if assignment is None:
+            abort(404)
+
+        values, errors = SUBMISSION_SCHEMA.validate(data)
+        if errors:
+            abort(400, description = describe(errors))
+        submission_url = values["submission_url"]
 
         if assignment.deadline <= datetime.utcnow():
             abort(400, description="Deadline has passed for this assignment")
-        
-        previous_submissions = Submission.query.filter_by(assignment_id=ass_id).all()
 
-        attempts_left = assignment.num_of_attempts - len(previous_submissions)
+        user_id = get_user_id_from_basic_auth()
+        attempt = SubmissionAttempt.claim(
+            ass_id, user_id, assignment.number_of_attempts
+        )
 
-        if attempts_left <= 0:
+        if attempt is None:
+            db.session.rollback()
             abort(400, description="No attempts left for this assignment")
 
-        submission_date =(
-            previous_submissions[-1].submission_date
-            if previous_submissions
-            else datetime.utcnow()
-        )
-
         submission = Submission(
             assignment_id = ass_id,
+            user_id = user_id,
             submission_url = submission_url,
-            submission_date = submission_date,
+            submission_date = datetime.utcnow(),
             assignment_updated =datetime.utcnow()
         )
 
         db.session.add(submission)
+
+        # Queued in the same transaction, the dispatcher publishes after commit
+        username = get_email_from_basic_auth()
+        publish_to_sns(submission_url, username, ass_id, assignment.name, attempt - 1)
         db.session.commit()
+        outbox_dispatcher.wake()
 
         logger.info("Submission created successfully.")
 
-        username = get_email_from_basic_auth()
-        publish_to_sns(submission_url, username, ass_id, assignment.name, len(previous_submissions))
-        logger.info("SNS message published successfully.")
-
         return create_response(201, submission.serialize())
 
     return app
\ No newline at end of file
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from app.seeding import file_checksum
+
+logger = logging.getLogger(__name__)
+
+# The schema create_all built before the migrations were tracked
+BASELINE_REVISION = "3f1c2a9d5b10"
+# pg_advisory_lock key, one schema upgrade at a time across hosts
+SCHEMA_LOCK_KEY = 0x77656261
+
+
+class BootTimer:
+    """Wall time of each create_app phase, in milliseconds"""
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def report(self, statsd=None):
+        self.timings["total"] = round((time.perf_counter() - self._started) * 1000, 3)
+        logger.info("Boot timings (ms): %s", " ".join(f"{k}={v}" for k, v in self.timings.items()))
+        if statsd is not None:
+            for name, elapsed_ms in self.timings.items():
+                statsd.timing(f"boot.{name}", elapsed_ms)
+        return self.timings
+
+
+class BootMarker:
+    """Local record of what the last boot on this host already verified.
+
+    Holds the migration head (so the scripts are only parsed again when
+    the versions directory changes) and the checksum of each seed file
+    loaded while the schema was current. Workers share it, so it is
+    written atomically.
+    """
+
+    def __init__(self, path, migrations_dir):
+        self.path = path
+        self.migrations_dir = migrations_dir
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(self.data, file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write boot marker %s: %s", self.path, e)
+
+    def _versions_fingerprint(self):
+        versions_dir = os.path.join(self.migrations_dir, "versions")
+        digest = hashlib.sha256()
+        for entry in sorted(os.scandir(versions_dir), key=lambda e: e.name):
+            if entry.name.endswith(".py"):
+                stat = entry.stat()
+                digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        return digest.hexdigest()
+
+    def head_revision(self):
+        fingerprint = self._versions_fingerprint()
+        if self.data.get("versions") != fingerprint:
+            from alembic.script import ScriptDirectory
+
+            self.data["versions"] = fingerprint
+            self.data["head"] = ScriptDirectory(self.migrations_dir).get_current_head()
+            self.data["seeds"] = {}
+            self._save()
+        return self.data["head"]
+
+    def schema_is_current(self, db):
+        """One query: is the database stamped at the migration head?"""
+        head = self.head_revision()
+        try:
+            revisions = db.session.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+        except SQLAlchemyError:
+            # Never migrated, e.g. a database built by create_all
+            db.session.rollback()
+            return False
+        db.session.rollback()
+        return head is not None and revisions == [head]
+
+    def seed_is_current(self, path):
+        return self.data.get("seeds", {}).get(path) == file_checksum(path)
+
+    def record_seed(self, path):
+        self.data.setdefault("seeds", {})[path] = file_checksum(path)
+        self._save()
+
+
+@contextmanager
+def schema_lock(db):
+    """Serialises schema changes across processes and hosts on PostgreSQL"""
+    with db.engine.connect() as connection:
+        if connection.dialect.name != "postgresql":
+            yield
+            return
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+
+
+def upgrade_schema(db):
+    """Migrate the database to the head revision, needs an app with Migrate.
+
+    A database create_all built before migrations were tracked has the
+    baseline tables but no alembic_version, so it is stamped at
+    BASELINE_REVISION once and only the later revisions run. An empty
+    database is built from the first revision.
+    """
+    from flask_migrate import stamp, upgrade
+
+    with schema_lock(db):
+        inspector = inspect(db.engine)
+        if not inspector.has_table("alembic_version") and inspector.has_table("user"):
+            logger.info("Unversioned schema, stamping baseline %s", BASELINE_REVISION)
+            stamp(revision=BASELINE_REVISION)
+        upgrade()
+
+
+def create_schema(db, migrations_dir):
+    """create_all and stamp the head revision, on an empty database only.
+
+    Returns False and leaves a database that already has tables alone:
+    changing an existing schema is upgrade_schema's job. The stamp is what
+    lets the next boot take the fast path.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    with schema_lock(db):
+        if inspect(db.engine).get_table_names():
+            return False
+        # The primary only, a replica gets the schema by replication
+        db.create_all(bind_key=None)
+        with db.engine.begin() as connection:
+            MigrationContext.configure(connection).stamp(ScriptDirectory(migrations_dir), "head")
+    logger.info("Created the schema and stamped it at the migration head")
+    return True
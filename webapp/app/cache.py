@@ -0,0 +1,256 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after insert"""
+
+    def __init__(self, maxsize=1024, ttl=300, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, maxsize, ttl):
+        with self._lock:
+            self.maxsize = maxsize
+            self.ttl = ttl
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= self._clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        """Drop every entry whose value matches ``predicate``"""
+        with self._lock:
+            stale = [k for k, (_, v) in self._data.items() if predicate(v)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CredentialCache:
+    """Remembers Basic Auth credentials that already passed bcrypt.
+
+    Entries are keyed by an HMAC of ``email`` and ``password`` so plaintext
+    passwords never sit in memory, and map to the verified user id.
+    Invalidation is per process; the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self._entries = TTLCache(maxsize, ttl)
+        self._secret = os.urandom(32)
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self._entries.configure(
+            app.config.get("AUTH_CACHE_SIZE", self._entries.maxsize),
+            app.config.get("AUTH_CACHE_TTL", self._entries.ttl),
+        )
+        secret = app.config.get("AUTH_CACHE_SECRET")
+        if secret:
+            self._secret = secret.encode("utf-8") if isinstance(secret, str) else secret
+        self.clear()
+
+    def _key(self, email, password):
+        message = f"{email}\x00{password}".encode("utf-8")
+        return hmac.new(self._secret, message, hashlib.sha256).digest()
+
+    def get(self, email, password):
+        """Return the cached user id for these credentials or None"""
+        entry = self._entries.get(self._key(email, password))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, email, password, user_id):
+        self._entries.set(self._key(email, password), (email, user_id))
+
+    def invalidate(self, email):
+        """Forget every cached credential for ``email``"""
+        return self._entries.delete_where(lambda entry: entry[0] == email)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class LocalCacheBackend:
+    """In-process LRU backend, invalidations only reach this worker"""
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self._entries = TTLCache(maxsize, ttl)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def delete(self, key):
+        self._entries.delete(key)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class RedisCacheBackend:
+    """Backend for any client speaking the Redis GET/SET/DEL commands.
+
+    Values are stored as JSON, so they must be JSON serializable. Being
+    shared, it also carries invalidations across workers and instances.
+    """
+
+    def __init__(self, client, prefix="webapp:", ttl=300):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        pass
+
+
+class ReadThroughCache:
+    """Read-through cache in front of a loader, with hit/miss accounting.
+
+    Backend errors are logged and treated as misses so a cache outage
+    degrades to plain database reads instead of failing requests.
+    """
+
+    def __init__(self, name, statsd=None, backend=None):
+        self.name = name
+        self.statsd = statsd
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        prefix = self.name.upper() + "_CACHE_"
+        kind = app.config.get(prefix + "BACKEND", "local")
+        ttl = app.config.get(prefix + "TTL", 30)
+
+        if kind == "local":
+            self.backend = LocalCacheBackend(app.config.get(prefix + "SIZE", 1024), ttl)
+        elif kind == "redis":
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError(f"{prefix}BACKEND=redis requires the redis package")
+            client = redis.Redis.from_url(app.config[prefix + "URL"])
+            self.backend = RedisCacheBackend(client, f"webapp:{self.name}:", ttl)
+        elif kind == "none":
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown {prefix}BACKEND: {kind}")
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.statsd:
+            self.statsd.incr(f"{self.name}.cache.{'hit' if hit else 'miss'}")
+
+    def get(self, key, loader):
+        """Return the cached value for ``key``, calling ``loader`` on a miss.
+
+        A loader returning None (e.g. row not found) is not cached.
+        """
+        if self.backend is None:
+            return loader(key)
+
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception("%s cache read failed", self.name)
+            value = None
+
+        self._count(value is not None)
+        if value is not None:
+            return value
+
+        value = loader(key)
+        if value is not None:
+            try:
+                self.backend.set(key, value)
+            except Exception:
+                logger.exception("%s cache write failed", self.name)
+        return value
+
+    def invalidate(self, key):
+        if self.backend is None:
+            return
+        try:
+            self.backend.delete(key)
+        except Exception:
+            logger.exception("%s cache invalidation failed", self.name)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
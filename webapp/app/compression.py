@@ -0,0 +1,154 @@
+import logging
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip alone is still negotiated
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_MIMETYPES = frozenset(("application/json",))
+
+
+class _BrotliEncoder:
+    """brotli.Compressor with the compress/flush interface of zlib"""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def gzip_encoder(level):
+    # wbits 31 adds the gzip header; zlib leaves its mtime zero, so equal
+    # bodies always compress to the same bytes
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def brotli_encoder(quality):
+    return _BrotliEncoder(quality)
+
+
+ENCODERS = {"br": brotli_encoder, "gzip": gzip_encoder}
+
+
+def encode(coding, level, data):
+    """Compress a whole body with ``coding`` at ``level``"""
+    encoder = ENCODERS[coding](level)
+    return encoder.compress(data) + encoder.flush()
+
+
+def encoded_etag(etag, coding):
+    """Strong tags name exact bytes, so each coding gets its own"""
+    return f"{etag}-{coding}"
+
+
+class ResponseCompressor:
+    """Compresses JSON responses in the encoding the client prefers.
+
+    Bodies under ``min_size`` bytes are sent as is, where compression costs
+    more CPU than the bytes it saves, and so is any body that would not
+    shrink. Streamed exports are compressed chunk by chunk.
+    """
+
+    def __init__(self, statsd=None):
+        self.statsd = statsd
+        self.enabled = True
+        self.algorithms = ("br", "gzip")
+        self.min_size = 1024
+        self.levels = {"br": 3, "gzip": 5}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("COMPRESSION_ENABLED", self.enabled)
+        self.min_size = app.config.get("COMPRESSION_MIN_SIZE", self.min_size)
+        self.levels = {
+            "br": app.config.get("COMPRESSION_BROTLI_QUALITY", self.levels["br"]),
+            "gzip": app.config.get("COMPRESSION_GZIP_LEVEL", self.levels["gzip"]),
+        }
+        algorithms = app.config.get("COMPRESSION_ALGORITHMS", ",".join(self.algorithms))
+        self.algorithms = tuple(
+            name.strip() for name in algorithms.split(",") if name.strip()
+        )
+        unknown = set(self.algorithms) - set(ENCODERS)
+        if unknown:
+            raise ValueError(f"Unknown COMPRESSION_ALGORITHMS: {', '.join(sorted(unknown))}")
+        if "br" in self.algorithms and brotli is None:
+            logger.warning("brotli is not installed, compressing with gzip only")
+            self.algorithms = tuple(name for name in self.algorithms if name != "br")
+        if self.enabled:
+            app.after_request(self.compress)
+
+    def negotiate(self, accept_encodings):
+        """The accepted coding with the highest q, ties in server order"""
+        best, best_quality = None, 0
+        for coding in self.algorithms:
+            quality = accept_encodings.quality(coding)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def compress(self, response):
+        if response.status_code == 304:
+            return self._revalidated(response)
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.status_code in (204, 206)
+        ):
+            return response
+        # Caches must key this URL's responses on the request's encodings
+        response.vary.add("Accept-Encoding")
+
+        coding = self.negotiate(request.accept_encodings)
+        if coding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), coding)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            compressed = encode(coding, self.levels[coding], body)
+            if len(compressed) >= len(body):
+                return response
+            response.set_data(compressed)
+            if self.statsd:
+                self.statsd.incr(f"compression.{coding}.bytes_saved", len(body) - len(compressed))
+
+        response.headers["Content-Encoding"] = coding
+        self._tag(response, coding)
+        return response
+
+    def _stream(self, chunks, coding):
+        encoder = ENCODERS[coding](self.levels[coding])
+        for chunk in chunks:
+            data = encoder.compress(chunk)
+            if data:
+                yield data
+        yield encoder.flush()
+
+    def _tag(self, response, coding):
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(encoded_etag(etag, coding), weak)
+
+    def _revalidated(self, response):
+        # Echo the tag the client cached, it may be of a compressed body
+        etag, weak = response.get_etag()
+        if not etag:
+            return response
+        for coding in self.algorithms:
+            if request.if_none_match.contains_weak(encoded_etag(etag, coding)):
+                response.set_etag(encoded_etag(etag, coding), weak)
+                response.vary.add("Accept-Encoding")
+                break
+        return response
@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime
+from flask import request
+from sqlalchemy import select
+from app.compression import ENCODERS, encoded_etag
+from app.extension import db
+from app.models import Assignment, CollectionVersion
+
+
+def _digest(*parts):
+    raw = "\x00".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def assignment_etag(ass_id, assignment_updated):
+    """Strong ETag for one assignment, changes whenever it is updated.
+
+    ``assignment_updated`` may be the column value or its isoformat()
+    string as found in a cached snapshot; both give the same tag.
+    """
+    if isinstance(assignment_updated, datetime):
+        assignment_updated = assignment_updated.isoformat()
+    return _digest("assignment", ass_id, assignment_updated)
+
+
+def collection_etag(version, variant=""):
+    """Strong ETag for the assignment collection.
+
+    ``version`` is the collection's CollectionVersion, moved on by every
+    insert, update and delete; ``variant`` keeps pages/projections apart.
+    """
+    return _digest("assignments", version, variant)
+
+
+def fetch_assignment_etag(ass_id):
+    """ETag of an assignment from its version column only, None if missing"""
+    row = db.session.execute(
+        select(Assignment.assignment_updated).where(Assignment.id == ass_id)
+    ).first()
+    if row is None:
+        return None
+    return assignment_etag(ass_id, row[0])
+
+
+def fetch_collection_etag(variant=""):
+    """One primary key lookup, whatever the size of the collection"""
+    return collection_etag(CollectionVersion.current("assignment"), variant)
+
+
+def is_not_modified(etag):
+    """True when the client's If-None-Match has ``etag``, of any encoding.
+
+    If-None-Match uses the weak comparison (RFC 7232 3.2): a W/ tag a
+    proxy or client sends back matches too.
+    """
+    if etag is None:
+        return False
+    if_none_match = request.if_none_match
+    return if_none_match.contains_weak(etag) or any(
+        if_none_match.contains_weak(encoded_etag(etag, coding)) for coding in ENCODERS
+    )
@@ -4,48 +4,94 @@ from logging.handlers import RotatingFileHandler
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from statsd import StatsClient
-import boto3
+from app.cache import CredentialCache, ReadThroughCache
+from app.compression import ResponseCompressor
+from app.hashing import HashingPool
+from app.health import HealthProber
+from app.outbox import OutboxDispatcher
+from app.log_pipeline import JSONLineFormatter, install as log_pipeline_install, parse_sample_rates
+from app.metrics import PipelinedStatsClient, RequestMetrics
+from app.profiler import SQLProfiler
+from app.replica import ReplicaRouter, RoutingSession
+from app.lazy import ProcessLocal
 
 # Retrieve SNS Topic ARN from environment variable
 sns_topic_arn = Config.SNS_TOPIC_ARN
 AWS_profile_name = Config.AWS_PROFILE_NAME
 
-# Create an SNS client
-session = boto3.Session()
-sns_client = session.client("sns", region_name="us-east-1")
-
-db = SQLAlchemy()
+# External clients are built on first use, once per process
+def _create_sns_client():
+    import boto3
+    return boto3.Session().client("sns", region_name="us-east-1")
+
+get_sns_client = ProcessLocal(_create_sns_client)
+
+# Stats sent while handling a request are batched and flushed when it ends
+statsd = PipelinedStatsClient(ProcessLocal(
+    lambda: StatsClient(host="localhost", port=8125, prefix="webapp")
+))
+request_metrics = RequestMetrics(statsd)
+response_compressor = ResponseCompressor(statsd)
+
+# Read-only routes may be served by the optional replica bind, while the
+# health prober has not seen it fail
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+health_prober = HealthProber()
+replica_router = ReplicaRouter(health_prober)
 bcrpyt = Bcrypt()
-
-# Function to publish messsage to SNS
+credential_cache = CredentialCache()
+hashing_pool = HashingPool(bcrpyt, statsd)
+assignment_cache = ReadThroughCache("assignment", statsd)
+log_pipeline = None
+outbox_dispatcher = OutboxDispatcher(db, get_sns_client, statsd)
+sql_profiler = SQLProfiler()
+
+# Function to build the SNS message for a submission
+def submission_message(submission_url, user_email, assigment_id, assignment_name, submission_attempt):
+    """SNS message body with submission URL and user email"""
+    return json.dumps({
+        "submission_url": submission_url,
+        "email": user_email,
+        'Path': f"{user_email}/{assigment_id}/{assignment_name}/{submission_attempt + 1}"
+    })
+
+# Function to queue a message for SNS, published after the caller's commit
 def publish_to_sns(submission_url, user_email, assigment_id, assignment_name, submission_attempt):
-    """Publishes a message to SNS topic with submission URL and user email"""
-    sns_client.publish(
-        TopicArn = sns_topic_arn,
-        Message=json.dumps({
-            "submission_url": submission_url,
-            "email": user_email,
-            'Path': f"{user_email}/{assigment_id}/{assignment_name}/{submission_attempt + 1}"
-        })
+    """Adds the submission message to the outbox in the current transaction"""
+    if not sns_topic_arn:
+        logging.getLogger(__name__).warning("SNS_TOPIC_ARN not set, submission event dropped")
+        return
+    outbox_dispatcher.enqueue(
+        sns_topic_arn,
+        submission_message(submission_url, user_email, assigment_id, assignment_name, submission_attempt)
     )
 
 
 
 def setup_logging(level = logging.INFO):
-    """setup logging for app"""
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    """setup logging for app, handlers run on a single listener thread"""
+    global log_pipeline
+    # Called from create_app, only the first call installs handlers
+    if log_pipeline is not None:
+        return logging.getLogger()
+
+    if Config.LOG_FORMAT == "json":
+        formatter = JSONLineFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
 
     # Set up the root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
+    handlers = []
 
     # Set up a simple console logger as a fallback
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     console_handler.setLevel(level)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # For non-Windows environments, attempt to set up file logging
     if not sys.platform.startswith("win"):
@@ -63,34 +109,39 @@ def setup_logging(level = logging.INFO):
             # Setup handlers for file logging
             info_log_path = os.path.join(log_directory, info_log_file)
             info_handler = RotatingFileHandler(
-                info_log_path, maxBytes=max_log_size, backupCount=backup_count
+                info_log_path, maxBytes=max_log_size, backupCount=backup_count, delay=True
             )
             info_handler.setLevel(logging.INFO)
             info_handler.setFormatter(formatter)
-            root_logger.addHandler(info_handler)
+            handlers.append(info_handler)
 
             error_log_path = os.path.join(log_directory, error_log_file)
             error_handler = RotatingFileHandler(
-                error_log_path, maxBytes=max_log_size, backupCount=backup_count
+                error_log_path, maxBytes=max_log_size, backupCount=backup_count, delay=True
             )
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(formatter)
-            root_logger.addHandler(error_handler)
+            handlers.append(error_handler)
 
         except PermissionError as e:
             print(f"Failed to create log directory '{log_directory}'. {e}")
         except OSError as e:
             print(f"Failed to create log directory '{log_directory}'. {e}")
 
-    return root_logger
+    # Request threads only enqueue, formatting and file I/O happen on the listener
+    log_pipeline = log_pipeline_install(
+        root_logger,
+        handlers,
+        maxsize=Config.LOG_QUEUE_SIZE,
+        sample_rates=parse_sample_rates(Config.LOG_SAMPLE_RATES),
+        statsd=statsd,
+    )
+    root_logger.info("Logging setup complete.")
 
-logger = setup_logging()
-if logger:
-    logger.info("Logging setup complete.")
-else:
-    print("Failed to setup file-based logging, falling back to console logging.")
+    return root_logger
 
-statsd = StatsClient(host="localhost", port=8125, prefix="webapp")
+# Handlers are attached by setup_logging() when the app is created
+logger = logging.getLogger()
 
 
 
@@ -0,0 +1,45 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def is_patched():
+    """True once gevent has monkey patched the standard library sockets"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+def enable(hashing_pool):
+    """Make the process's blocking clients cooperative for SERVING_MODE=gevent.
+
+    The server (``gunicorn -k gevent``) has already monkey patched sockets,
+    threads and sleeps, so SNS calls, statsd, the outbox and health threads
+    yield while they wait. psycopg2 is a C extension and needs psycogreen's
+    wait callback to run libpq in async mode. bcrypt holds the CPU, so it
+    moves to gevent's native thread pool instead of green threads.
+    """
+    if not is_patched():
+        raise RuntimeError(
+            "SERVING_MODE=gevent requires gevent monkey patching before the app "
+            "is imported, serve it with gunicorn -k gevent"
+        )
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        raise RuntimeError("SERVING_MODE=gevent requires the psycogreen package")
+    from gevent.threadpool import ThreadPoolExecutor
+
+    patch_psycopg()
+    hashing_pool.use_executor(ThreadPoolExecutor)
+    logger.info("Serving cooperatively on gevent")
+
+
+def check_sync_mode():
+    if is_patched():
+        logger.warning(
+            "gevent monkey patching is active but SERVING_MODE=sync, "
+            "database and bcrypt calls will block the event loop"
+        )
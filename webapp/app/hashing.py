@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+class HashPoolSaturated(Exception):
+    """Raised when the hashing pool has no room for another job"""
+
+
+class HashingPool:
+    """Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so a few threads give real parallelism while
+    keeping password checks off the request threads' CPU budget. At most
+    ``workers + queue_depth`` jobs are admitted; anything beyond that fails
+    fast with HashPoolSaturated instead of queueing behind a login burst.
+    """
+
+    def __init__(self, bcrypt, statsd=None, workers=2, queue_depth=32, timeout=10):
+        self.bcrypt = bcrypt
+        self.statsd = statsd
+        self.timeout = timeout
+        self.executor_class = ThreadPoolExecutor
+        self._configure(workers, queue_depth)
+
+    def _configure(self, workers, queue_depth):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.timeout = app.config.get("HASH_POOL_TIMEOUT", self.timeout)
+        self.shutdown()
+        self._configure(
+            app.config.get("HASH_POOL_WORKERS", self.workers),
+            app.config.get("HASH_POOL_QUEUE_DEPTH", self.queue_depth),
+        )
+
+    def _get_executor(self):
+        # Created lazily so forked workers never inherit a parent's threads
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = self.executor_class(
+                        max_workers=self.workers, thread_name_prefix="bcrypt"
+                    )
+        return self._executor
+
+    def use_executor(self, executor_class):
+        """Run jobs on ``executor_class``, e.g. gevent's native thread pool"""
+        self.shutdown()
+        self.executor_class = executor_class
+
+    def shutdown(self):
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _timed(self, enqueued_at, fn, args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            self._slots.release()
+            if self.statsd:
+                self.statsd.timing("bcrypt.queue_wait", (started - enqueued_at) * 1000)
+                self.statsd.timing("bcrypt.hash", (finished - started) * 1000)
+
+    def run(self, fn, *args):
+        """Run ``fn`` on the pool and wait for its result"""
+        if not self._slots.acquire(blocking=False):
+            if self.statsd:
+                self.statsd.incr("bcrypt.rejected")
+            raise HashPoolSaturated("Password hashing queue is full")
+
+        try:
+            future = self._get_executor().submit(
+                self._timed, time.perf_counter(), fn, args
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            if self.statsd:
+                self.statsd.incr("bcrypt.timeout")
+            raise HashPoolSaturated("Password hashing timed out")
+
+    def generate_password_hash(self, password):
+        return self.run(self.bcrypt.generate_password_hash, password)
+
+    def check_password_hash(self, pw_hash, password):
+        return self.run(self.bcrypt.check_password_hash, pw_hash, password)
@@ -0,0 +1,110 @@
+import logging
+import time
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.lazy import ProcessThread
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProber:
+    """Background ``SELECT 1`` prober backing the shallow /healthz check.
+
+    The ALB hits /healthz far more often than the database state changes,
+    so the check only reads the last cached probe. A result older than
+    ``max_age`` counts as unhealthy, which also covers a dead prober thread.
+    Health is the primary's, which takes every write; a configured replica
+    is probed alongside and only decides where reads go.
+    """
+
+    def __init__(self, interval=5, max_age=15):
+        self.interval = interval
+        self.max_age = max_age
+        self.bind_key = None
+        self.app = None
+        self._status = None
+        self._thread = ProcessThread(self._run, "health-prober")
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.get("HEALTH_PROBE_INTERVAL", self.interval)
+        self.max_age = app.config.get("HEALTH_PROBE_MAX_AGE", self.max_age)
+        self.bind_key = "replica" if "replica" in (app.config.get("SQLALCHEMY_BINDS") or {}) else None
+        self._status = None
+
+    def check(self, engine):
+        """One round trip to ``engine``, uncached"""
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            status = {"healthy": True, "error": None}
+        except SQLAlchemyError as e:
+            logger.warning("Database health probe failed: %s", e)
+            status = {"healthy": False, "error": e.__class__.__name__}
+
+        status["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        status["checked_at"] = time.monotonic()
+        return status
+
+    def probe(self):
+        """Round trips to the primary and any replica, cached as one status"""
+        from app.extension import db
+
+        with self.app.app_context():
+            status = self.check(db.engine)
+            if self.bind_key is not None:
+                status["replica"] = self.check(db.engines[self.bind_key])
+        self._status = status
+        return status
+
+    def _run(self):
+        while not self._thread.stopping.wait(self.interval):
+            try:
+                self.probe()
+            except Exception:
+                logger.exception("Database health probe crashed")
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._thread.stop()
+
+    def status(self):
+        """Last probe result, probing inline only before the first one"""
+        self.start()
+        status = self._status
+        if status is None:
+            status = self.probe()
+        if self._stale(status):
+            return {**status, "healthy": False, "error": "stale"}
+        return status
+
+    def replica_healthy(self):
+        """False only when the last fresh probe saw the replica fail.
+
+        Never probes inline, it is asked on every read-only query; until a
+        probe has run the replica gets the benefit of the doubt.
+        """
+        if self.bind_key is None:
+            return False
+        self.start()
+        status = self._status
+        if status is None or self._stale(status):
+            return True
+        return status["replica"]["healthy"]
+
+    def _stale(self, status):
+        return time.monotonic() - status["checked_at"] > self.max_age
+
+
+def pool_stats(engine):
+    """Connection pool counters, for pools that expose them"""
+    pool = engine.pool
+    stats = {"class": pool.__class__.__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
@@ -1,59 +1,65 @@
-from flask import Response, jsonify
+from flask import Response, jsonify, stream_with_context
 import re
-import csv
-from datetime import datetime
-from app.models import User
-from app.extension import db
+from app.serializers import dumps
 
-def create_response(status_code, data=None):
-    response = jsonify(data) if data else Response()
-    response.status_code = status_code
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+def apply_default_headers(response, etag=None):
+    if etag is None:
+        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    else:
+        # Clients may keep the body but must revalidate it with If-None-Match
+        response.headers["Cache-Control"] = "private, no-cache, must-revalidate"
+        response.set_etag(etag)
     response.headers['X-Content-Type-Options'] = 'nosniff'
     return response
 
-def load_users_from_csv():
-    with open('login.csv', 'r') as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            if is_valid_email(row['email']) and is_valid_password(row['password']) and len(row['first_name']) > 0 and len(row['last_name']) > 0:
-                user = User.query.filter_by(email=row['email']).first()
-                if not user:
-                    new_user = User(
-                        first_name = row['first_name'],
-                        last_name = row['last_name'],
-                        email = row['email']
-                    )
-                    new_user.password = row['password']
-                    db.session.add(new_user)
-        db.session.commit()
+def create_response(status_code, data=None, etag=None):
+    response = jsonify(data) if data is not None else Response()
+    response.status_code = status_code
+    return apply_default_headers(response, etag)
+
+def create_stream_response(status_code, items, chunk_size=500, etag=None):
+    """Stream ``items`` as a JSON array without materializing the list"""
+    response = Response(
+        stream_with_context(stream_json_array(items, chunk_size)),
+        mimetype="application/json",
+    )
+    response.status_code = status_code
+    return apply_default_headers(response, etag)
+
+def stream_json_array(items, chunk_size=500):
+    """Yield a JSON array in chunks of ``chunk_size`` encoded items"""
+    yield "["
+    separator = ""
+    chunk = []
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) >= chunk_size:
+            yield separator + ",".join(chunk)
+            separator = ","
+            chunk = []
+    if chunk:
+        yield separator + ",".join(chunk)
+    yield "]"
+
+_EMAIL = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*()')
 
 def is_valid_email(email):
-    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
-    return re.match(pattern, email) is not None
+    return _EMAIL.match(email) is not None
 
 def is_valid_password(password):
+    """At least 6 characters with a digit, upper, lower and special, in one pass"""
     if len(password) < 6:
         return False
-    
-    if not any(char.isdigit() for char in password):
-        return False
-    if not any(char.isupper() for char in password):
-        return False
-    if not any(char.islower() for char in password):
-        return False
-    if not any(char in '!@#$%^&*()' for char in password):
-        return False
-    return True
-
-def validate_datetime_format(dt_str):
-    try:
-        dt_obj = datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S.%fZ")
-        return True, dt_obj
-    except ValueError:
-        return False, None
-
-
-
-
 
+    digit = upper = lower = special = False
+    for char in password:
+        if char.isdigit():
+            digit = True
+        elif char.isupper():
+            upper = True
+        elif char.islower():
+            lower = True
+        if char in _PASSWORD_SPECIALS:
+            special = True
+    return digit and upper and lower and special
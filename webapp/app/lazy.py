@@ -0,0 +1,62 @@
+import os
+import threading
+
+
+class ProcessLocal:
+    """Builds a value on first call and caches it for the current process.
+
+    Clients holding sockets or threads are not safe to share across fork,
+    so a forked worker builds its own on first use instead of inheriting
+    the parent's. Nothing is built at import time.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._value = self.factory()
+                    self._pid = os.getpid()
+        return self._value
+
+    def built(self):
+        return self._pid == os.getpid()
+
+
+class ProcessThread:
+    """Daemon thread running ``target``, started at most once per process.
+
+    Threads do not survive fork, so a forked worker starts its own on first
+    use instead of trusting the parent's handle. ``target`` should return
+    once ``stopping`` is set.
+    """
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+        self.stopping = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def alive(self):
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def start(self):
+        if self.alive():
+            return
+        with self._lock:
+            if self.alive():
+                return
+            self.stopping.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self.target, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self.stopping.set()
@@ -0,0 +1,152 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+
+class JSONLineFormatter(logging.Formatter):
+    """One compact JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of records per level, e.g. {logging.INFO: 0.1}"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+        self.sampled_out = 0
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno, 1.0)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+def parse_sample_rates(raw):
+    """Turn "INFO=0.1,DEBUG=0" into {logging.INFO: 0.1, logging.DEBUG: 0.0}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in (raw or "").split(","))):
+        level, _, rate = item.partition("=")
+        rates[logging.getLevelName(level.strip().upper())] = float(rate)
+    return rates
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller, dropping records when full"""
+
+    def __init__(self, pipeline):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        # Merge args now, they may be mutated after the call returns;
+        # formatting and exc_info rendering stay on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.pipeline.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class LogPipeline:
+    """Request threads enqueue, one listener thread formats and writes.
+
+    A fresh queue and listener are created in forked children (gunicorn
+    workers), since the parent's listener thread does not survive fork.
+    """
+
+    def __init__(self, handlers, maxsize=10000, statsd=None, report_interval=10):
+        self.handlers = handlers
+        self.maxsize = maxsize
+        self.statsd = statsd
+        self.report_interval = report_interval
+        self.dropped = 0
+        self.sampler = None
+        self.queue = queue.Queue(maxsize)
+        self.listener = None
+        self._last_report = time.monotonic()
+
+    def start(self):
+        self.listener = _ReportingListener(self, self.queue, *self.handlers)
+        self.listener.start()
+        return self
+
+    def stop(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def restart_in_child(self):
+        self.queue = queue.Queue(self.maxsize)
+        self.dropped = 0
+        self.start()
+
+    def report(self):
+        now = time.monotonic()
+        if now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+        if self.statsd:
+            stats = self.stats()
+            self.statsd.gauge("logging.queue_depth", stats["queue_depth"])
+            self.statsd.gauge("logging.dropped", stats["dropped"])
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "dropped": self.dropped,
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+        }
+
+
+class _ReportingListener(QueueListener):
+    def __init__(self, pipeline, *args):
+        super().__init__(*args, respect_handler_level=True)
+        self.pipeline = pipeline
+        self.pid = os.getpid()
+
+    def handle(self, record):
+        # Under gevent the listener survives fork as a greenlet, the parent's
+        # records it still holds are the parent's to write
+        if self.pid != os.getpid():
+            return
+        super().handle(record)
+        self.pipeline.report()
+
+
+def install(root_logger, handlers, maxsize=10000, sample_rates=None, statsd=None):
+    """Route ``root_logger`` through a LogPipeline feeding ``handlers``"""
+    pipeline = LogPipeline(handlers, maxsize, statsd).start()
+    queue_handler = DroppingQueueHandler(pipeline)
+    if sample_rates:
+        pipeline.sampler = SamplingFilter(sample_rates)
+        queue_handler.addFilter(pipeline.sampler)
+    # The queue handler reads pipeline.queue, which is replaced after fork
+    os.register_at_fork(after_in_child=pipeline.restart_in_child)
+    atexit.register(pipeline.stop)
+    root_logger.addHandler(queue_handler)
+    return pipeline
+
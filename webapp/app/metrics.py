@@ -0,0 +1,86 @@
+import time
+from flask import g, has_request_context, request
+
+
+class PipelinedStatsClient:
+    """StatsClient facade that batches stats sent while handling a request.
+
+    Inside a request every incr/timing/gauge lands in that request's statsd
+    pipeline, sent as one UDP packet (split at the UDP size limit) when the
+    request ends. Background threads have no request and send directly.
+    """
+
+    def __init__(self, client_getter):
+        self.client_getter = client_getter
+
+    @property
+    def client(self):
+        return self.client_getter()
+
+    def _target(self):
+        if has_request_context():
+            pipeline = g.get("statsd_pipeline")
+            if pipeline is not None:
+                return pipeline
+        return self.client
+
+    def incr(self, stat, count=1, rate=1):
+        self._target().incr(stat, count, rate)
+
+    def decr(self, stat, count=1, rate=1):
+        self._target().decr(stat, count, rate)
+
+    def timing(self, stat, delta, rate=1):
+        self._target().timing(stat, delta, rate)
+
+    def gauge(self, stat, value, rate=1, delta=False):
+        self._target().gauge(stat, value, rate, delta)
+
+    def set(self, stat, value, rate=1):
+        self._target().set(stat, value, rate)
+
+    def pipeline(self):
+        return self.client.pipeline()
+
+
+class RequestMetrics:
+    """Per-route latency, status and payload size metrics from app hooks"""
+
+    def __init__(self, statsd):
+        self.statsd = statsd
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        g.statsd_pipeline = self.statsd.pipeline()
+        g.request_started = time.perf_counter()
+
+    def _record(self, status_code, response_bytes=None):
+        pipeline = g.get("statsd_pipeline")
+        started = g.get("request_started")
+        if pipeline is None or started is None or g.get("request_recorded"):
+            return
+        g.request_recorded = True
+
+        route = f"route.{request.endpoint or 'unmatched'}"
+        pipeline.timing(f"{route}.time", (time.perf_counter() - started) * 1000)
+        pipeline.incr(f"{route}.status.{status_code}")
+        if request.content_length:
+            pipeline.timing(f"{route}.request_bytes", request.content_length)
+        if response_bytes is not None:
+            pipeline.timing(f"{route}.response_bytes", response_bytes)
+
+    def _after_request(self, response):
+        # Streamed bodies have no length yet and are left out of the size metric
+        self._record(response.status_code, response.content_length)
+        return response
+
+    def _teardown_request(self, error=None):
+        if error is not None:
+            self._record(500)
+        pipeline = g.pop("statsd_pipeline", None)
+        if pipeline is not None:
+            pipeline.send()
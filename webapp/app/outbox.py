@@ -0,0 +1,157 @@
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.lazy import ProcessThread
+
+logger = logging.getLogger(__name__)
+
+# SNS PublishBatch accepts at most this many entries per call
+PUBLISH_BATCH_LIMIT = 10
+
+
+class OutboxDispatcher:
+    """Drains the outbox table to SNS from a background thread.
+
+    Messages are written by request handlers in the same transaction as
+    the data they describe, so a commit can never lose its event and the
+    request never waits on SNS. Each worker runs one dispatcher; rows are
+    claimed with FOR UPDATE SKIP LOCKED so workers never double publish.
+    """
+
+    def __init__(self, db, client_getter, statsd=None):
+        self.db = db
+        self.client_getter = client_getter
+        self.statsd = statsd
+        self.app = None
+        self.enabled = True
+        self.poll_interval = 5
+        self.fetch_size = 100
+        self.max_attempts = 8
+        self.backoff_base = 1
+        self.backoff_max = 300
+        self._thread = ProcessThread(self._run, "outbox-dispatcher")
+        self._wakeup = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get("OUTBOX_DISPATCHER_ENABLED", self.enabled)
+        self.poll_interval = app.config.get("OUTBOX_POLL_INTERVAL", self.poll_interval)
+        self.fetch_size = app.config.get("OUTBOX_FETCH_SIZE", self.fetch_size)
+        self.max_attempts = app.config.get("OUTBOX_MAX_ATTEMPTS", self.max_attempts)
+        self.backoff_base = app.config.get("OUTBOX_BACKOFF_BASE", self.backoff_base)
+        self.backoff_max = app.config.get("OUTBOX_BACKOFF_MAX", self.backoff_max)
+
+    def enqueue(self, topic_arn, message):
+        """Add a message to the current transaction, the caller commits"""
+        from app.models import OutboxMessage
+
+        self.db.session.add(OutboxMessage(topic_arn=topic_arn, payload=message))
+
+    def wake(self):
+        """Ask the dispatcher to drain now rather than at the next poll"""
+        if not self.enabled:
+            return
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        if self.enabled:
+            self._thread.start()
+
+    def stop(self):
+        self._thread.stop()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._thread.stopping.is_set():
+            try:
+                # Keep going while full batches come back
+                while self.drain_once() >= self.fetch_size:
+                    pass
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _backoff(self, attempts):
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        return timedelta(seconds=delay + random.uniform(0, self.backoff_base))
+
+    def drain_once(self):
+        """Publish one fetch of due messages, returning how many were claimed"""
+        from app.models import OutboxMessage
+
+        with self.app.app_context():
+            session = self.db.session
+            now = datetime.utcnow()
+            messages = session.execute(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.attempts < self.max_attempts,
+                    OutboxMessage.next_attempt_at <= now,
+                )
+                .order_by(OutboxMessage.id)
+                .limit(self.fetch_size)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not messages:
+                session.rollback()
+                return 0
+
+            by_topic = {}
+            for message in messages:
+                by_topic.setdefault(message.topic_arn, []).append(message)
+
+            published = failed = 0
+            for topic_arn, topic_messages in by_topic.items():
+                for i in range(0, len(topic_messages), PUBLISH_BATCH_LIMIT):
+                    batch = topic_messages[i:i + PUBLISH_BATCH_LIMIT]
+                    errors = self._publish_batch(topic_arn, batch)
+                    for message in batch:
+                        error = errors.get(str(message.id))
+                        if error is None:
+                            session.delete(message)
+                            published += 1
+                        else:
+                            self._record_failure(message, error, now)
+                            failed += 1
+
+            session.commit()
+
+        if self.statsd:
+            self.statsd.incr("outbox.published", published)
+            if failed:
+                self.statsd.incr("outbox.failed", failed)
+        return len(messages)
+
+    def _publish_batch(self, topic_arn, batch):
+        """PublishBatch one chunk, returning {entry id: error} for failures"""
+        entries = [
+            {"Id": str(message.id), "Message": message.payload} for message in batch
+        ]
+        try:
+            response = self.client_getter().publish_batch(
+                TopicArn=topic_arn, PublishBatchRequestEntries=entries
+            )
+        except Exception as e:
+            logger.warning("SNS PublishBatch to %s failed: %s", topic_arn, e)
+            return {entry["Id"]: str(e) for entry in entries}
+
+        return {
+            failure["Id"]: failure.get("Message") or failure.get("Code", "failed")
+            for failure in response.get("Failed", [])
+        }
+
+    def _record_failure(self, message, error, now):
+        message.attempts += 1
+        message.last_error = str(error)[:500]
+        message.next_attempt_at = now + self._backoff(message.attempts)
+        if message.attempts >= self.max_attempts:
+            logger.error(
+                "Outbox message %s gave up after %s attempts: %s",
+                message.id, message.attempts, error,
+            )
+            if self.statsd:
+                self.statsd.incr("outbox.dead")
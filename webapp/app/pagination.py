@@ -0,0 +1,111 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from app.extension import db
+from app.models import Assignment
+from app.serializers import row_serializer
+
+# Public columns of an assignment, in the order Assignment.serialize emits them
+ASSIGNMENT_FIELDS = (
+    "id",
+    "name",
+    "points",
+    "number_of_attempts",
+    "deadline",
+    "assignment_created",
+    "assignment_updated",
+)
+
+
+def encode_cursor(assignment_created, ass_id):
+    """Opaque cursor pointing just after (assignment_created, id)"""
+    raw = json.dumps([assignment_created.isoformat(), ass_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        created, ass_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created), str(ass_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(raw, default, maximum):
+    if raw is None or raw == "":
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not (1 <= limit <= maximum):
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
+
+
+def parse_fields(raw):
+    """Turn ``fields=a,b`` into a tuple of known column names"""
+    if not raw:
+        return ASSIGNMENT_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in ASSIGNMENT_FIELDS]
+    if not fields or unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or raw}")
+    return fields
+
+
+def after_cursor(stmt, cursor):
+    """Restrict ``stmt`` to rows ordered after the keyset ``cursor``"""
+    if cursor is None:
+        return stmt
+    return stmt.where(
+        tuple_(Assignment.assignment_created, Assignment.id) > tuple_(*cursor)
+    )
+
+
+def assignment_page_query(fields, limit, cursor=None):
+    """Keyset query over (assignment_created, id) selecting only ``fields``.
+
+    The two keyset columns are always appended last so the next cursor can
+    be built without them being part of the projection.
+    """
+    columns = [getattr(Assignment, field) for field in fields]
+    stmt = after_cursor(
+        select(*columns, Assignment.assignment_created, Assignment.id), cursor
+    )
+    return stmt.order_by(Assignment.assignment_created, Assignment.id).limit(limit + 1)
+
+
+def iter_assignments(fields, cursor=None, batch_size=1000):
+    """Yield every assignment after ``cursor`` using a server-side cursor.
+
+    ``yield_per`` makes the driver fetch ``batch_size`` rows at a time, so
+    memory stays flat however many assignments exist.
+    """
+    columns = [getattr(Assignment, field) for field in fields]
+    stmt = after_cursor(select(*columns), cursor).order_by(
+        Assignment.assignment_created, Assignment.id
+    )
+
+    serialize = row_serializer(Assignment, fields)
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for row in result:
+            yield serialize(row)
+    finally:
+        result.close()
+
+
+def fetch_assignment_page(fields, limit, cursor=None):
+    """Return one page of serialized assignments and the cursor for the next"""
+    rows = db.session.execute(assignment_page_query(fields, limit, cursor)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+
+    return row_serializer(Assignment, fields).many(rows), next_cursor
@@ -0,0 +1,56 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from app.extension import statsd
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait, usage and timeouts to statsd"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            statsd.incr("db.pool.timeout")
+            raise
+        statsd.timing("db.pool.checkout_wait", (time.perf_counter() - started) * 1000)
+        self._report_usage()
+        return connection
+
+    def _report_usage(self):
+        # Sampled at checkout only, so it rides the request's statsd pipeline;
+        # connections are returned after it is sent. Timers, not gauges: every
+        # worker reports under one name and statsd keeps the max and
+        # percentiles across them instead of the last worker's value
+        statsd.timing("db.pool.in_use", self.checkedout())
+        statsd.timing("db.pool.overflow", max(self.overflow(), 0))
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings.
+
+    Pool sizing only applies to pooled (non-SQLite) URIs and the server-side
+    statement_timeout only to PostgreSQL. Anything set explicitly in
+    SQLALCHEMY_ENGINE_OPTIONS wins.
+    """
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    options = {
+        "pool_pre_ping": config.get("DB_POOL_PRE_PING", True),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", 1800),
+    }
+
+    if not uri.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=config.get("DB_POOL_SIZE", 5),
+            max_overflow=config.get("DB_MAX_OVERFLOW", 5),
+            pool_timeout=config.get("DB_POOL_TIMEOUT", 10),
+        )
+
+    statement_timeout = config.get("DB_STATEMENT_TIMEOUT_MS")
+    if uri.startswith("postgresql") and statement_timeout:
+        options["connect_args"] = {"options": f"-c statement_timeout={int(statement_timeout)}"}
+
+    options.update(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return options
@@ -0,0 +1,118 @@
+import heapq
+import logging
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryProfile:
+    """Queries run while handling one request"""
+
+    def __init__(self, top_n=3):
+        self.top_n = top_n
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest = []
+        self.statements = {}
+
+    def record(self, statement, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        seen = self.statements.get(statement, 0)
+        self.statements[statement] = seen + 1
+        # Min-heap of the top_n slowest, the root is the one to evict
+        entry = (elapsed_ms, self.count, statement)
+        if len(self.slowest) < self.top_n:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self):
+        return [
+            (round(elapsed_ms, 3), statement)
+            for elapsed_ms, _, statement in sorted(self.slowest, reverse=True)
+        ]
+
+    def repeated(self, threshold):
+        """Identical statements run at least ``threshold`` times, likely N+1"""
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+class SQLProfiler:
+    """Opt-in per-request SQL profiling on engine cursor events.
+
+    When enabled, every request gets a QueryProfile; its query count and DB
+    time go out in a ``Server-Timing`` header, and slow requests or repeated
+    identical statements (N+1) are logged. When disabled no listeners or
+    hooks are registered at all.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_request_ms = 500
+        self.repeat_threshold = 5
+        self.top_n = 3
+
+    def init_app(self, app):
+        self.enabled = app.config.get("SQL_PROFILER_ENABLED", self.enabled)
+        self.slow_request_ms = app.config.get("SQL_PROFILER_SLOW_REQUEST_MS", self.slow_request_ms)
+        self.repeat_threshold = app.config.get("SQL_PROFILER_REPEAT_THRESHOLD", self.repeat_threshold)
+        self.top_n = app.config.get("SQL_PROFILER_TOP_N", self.top_n)
+        if not self.enabled:
+            return
+
+        # Listening on the Engine class covers every engine and bind
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        g.sql_profile = QueryProfile(self.top_n)
+        g.sql_profile_started = time.perf_counter()
+
+    def _after_request(self, response):
+        profile = g.pop("sql_profile", None)
+        if profile is None:
+            return response
+        elapsed_ms = (time.perf_counter() - g.pop("sql_profile_started")) * 1000
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={profile.total_ms:.3f};desc="{profile.count} queries", '
+            f"app;dur={elapsed_ms:.3f}",
+        )
+
+        repeated = profile.repeated(self.repeat_threshold)
+        if repeated or elapsed_ms >= self.slow_request_ms:
+            logger.warning(
+                "Slow or chatty request %s %s: %.1f ms, %d queries in %.1f ms, "
+                "slowest %s, repeated %s",
+                request.method, request.path, elapsed_ms,
+                profile.count, profile.total_ms,
+                profile.slowest_statements(), repeated,
+            )
+        return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "sql_profile" in g:
+        conn.info.setdefault("sql_profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("sql_profile_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    profile = g.get("sql_profile") if has_request_context() else None
+    if profile is not None:
+        profile.record(statement, elapsed_ms)
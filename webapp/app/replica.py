@@ -0,0 +1,88 @@
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# Unix time until which the client's reads go to the primary
+PIN_COOKIE = "read_primary_until"
+
+
+class ReplicaRouter:
+    """Sends queries of read-only routes to the ``replica`` bind.
+
+    Everything else, and every flush, stays on the primary. A successful
+    write sets a cookie pinning the client to the primary for
+    ``pin_seconds``, so their next reads do not race replication lag
+    whichever worker or host serves them. While ``health`` reports the
+    replica down, reads fall back to the primary.
+    """
+
+    def __init__(self, health=None):
+        self.enabled = False
+        self.pin_seconds = 5
+        self.health = health
+
+    def init_app(self, app):
+        app.extensions["replica_router"] = self
+        self.enabled = REPLICA_BIND in (app.config.get("SQLALCHEMY_BINDS") or {})
+        self.pin_seconds = app.config.get("REPLICA_PIN_SECONDS", self.pin_seconds)
+        if self.enabled:
+            app.after_request(self._pin_writer)
+
+    def read_only(self, fn):
+        """Route decorator: this view's queries may be served by the replica"""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            g.db_read_only = True
+            return fn(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def primary(self):
+        """Queries inside go to the primary, for data other requests reuse"""
+        read_only = g.get("db_read_only")
+        g.db_read_only = False
+        try:
+            yield
+        finally:
+            g.db_read_only = read_only
+
+    def use_replica(self):
+        if not (self.enabled and has_request_context() and g.get("db_read_only")):
+            return False
+        if self.health is not None and not self.health.replica_healthy():
+            return False
+        return not self._pinned()
+
+    def _pinned(self):
+        try:
+            until = float(request.cookies.get(PIN_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
+
+    def _pin_writer(self, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE,
+                f"{time.time() + self.pin_seconds:.3f}",
+                max_age=math.ceil(self.pin_seconds),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that asks the ReplicaRouter for reads"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            router = current_app.extensions.get("replica_router")
+            if router is not None and router.use_replica():
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,130 @@
+import re
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+MISSING_MESSAGE = "Missing required fields"
+
+# The one timestamp shape the API accepts, e.g. 2030-01-01T00:00:00.000Z
+_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})\.(\d{1,6})Z", re.ASCII
+)
+
+_INVALID = object()
+
+
+def parse_datetime(value):
+    """Parse ``YYYY-MM-DDTHH:MM:SS.ffffffZ`` to a naive UTC datetime, or None"""
+    match = _ISO_DATETIME.fullmatch(value)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction = match.groups()
+    try:
+        return datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second),
+            int(fraction.ljust(6, "0")),
+        )
+    except ValueError:
+        return None
+
+
+class Field(ABC):
+    """One payload key; ``compile`` returns a check giving the value or _INVALID"""
+
+    def __init__(self, name, message):
+        self.name = name
+        self.message = message
+
+    @abstractmethod
+    def compile(self):
+        ...
+
+
+class String(Field):
+    def __init__(self, name, message, max_length=None):
+        super().__init__(name, message)
+        self.max_length = max_length
+
+    def compile(self):
+        max_length = self.max_length
+
+        def check(value):
+            if type(value) is not str or (max_length is not None and len(value) > max_length):
+                return _INVALID
+            return value
+        return check
+
+
+class Integer(Field):
+    def __init__(self, name, message, minimum, maximum):
+        super().__init__(name, message)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def compile(self):
+        minimum, maximum = self.minimum, self.maximum
+
+        def check(value):
+            # bool is an int subclass, but true is not a point count
+            if type(value) is not int or not minimum <= value <= maximum:
+                return _INVALID
+            return value
+        return check
+
+
+class DateTime(Field):
+    def compile(self):
+        def check(value):
+            parsed = parse_datetime(value) if type(value) is str else None
+            return _INVALID if parsed is None else parsed
+        return check
+
+
+class Schema:
+    """Declarative payload schema, compiled once into per-field checks.
+
+    ``validate`` walks every field, so all errors come back together as
+    {field: message} rather than stopping at the first.
+    """
+
+    def __init__(self, name, *fields):
+        self.not_object_message = f"{name} must be a JSON object"
+        self._checks = tuple((field.name, field.message, field.compile()) for field in fields)
+
+    def validate(self, data):
+        """Return (values, None) or (None, {field: message})"""
+        if not isinstance(data, dict):
+            return None, {"_schema": self.not_object_message}
+        values = {}
+        errors = {}
+        for name, message, check in self._checks:
+            value = data.get(name)
+            if value is None or value == "":
+                errors[name] = MISSING_MESSAGE
+                continue
+            value = check(value)
+            if value is _INVALID:
+                errors[name] = message
+            else:
+                values[name] = value
+        if errors:
+            return None, errors
+        return values, None
+
+
+def describe(errors):
+    """One line for an error response, each distinct message once"""
+    return "; ".join(dict.fromkeys(errors.values()))
+
+
+ASSIGNMENT_SCHEMA = Schema(
+    "Assignment",
+    String("name", "Name must be at most 50 characters", max_length=50),
+    Integer("points", "Points must between 1 and 100", 1, 100),
+    Integer("number_of_attempts", "No of attempts must between 1 and 100", 1, 100),
+    DateTime("deadline", "Invalid Deadline format"),
+)
+
+SUBMISSION_SCHEMA = Schema(
+    "Submission",
+    String("submission_url", "Submission URL must be at most 200 characters", max_length=200),
+)
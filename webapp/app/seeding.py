@@ -0,0 +1,107 @@
+import csv
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+import bcrypt
+from flask import current_app
+from sqlalchemy import insert, select
+from app.extension import db
+from app.helper_func import is_valid_email, is_valid_password
+from app.models import SeedState, User
+
+logger = logging.getLogger(__name__)
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_valid_rows(path):
+    """Stream the CSV rows that pass the same checks as sign-up"""
+    with open(path, 'r') as file:
+        for row in csv.DictReader(file):
+            if is_valid_email(row['email']) and is_valid_password(row['password']) and len(row['first_name']) > 0 and len(row['last_name']) > 0:
+                yield row
+
+
+def hash_password(password, rounds):
+    """Same hash Flask-Bcrypt produces, runs in a seeding worker process"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds, prefix=b'2b')).decode('utf-8')
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def load_users_from_csv(path='login.csv'):
+    """Create the users listed in ``path`` that do not exist yet.
+
+    Skipped entirely when the file's checksum matches the last seed. New
+    passwords are hashed in a process pool and inserted in bulk, one
+    existing-email query and one INSERT per chunk. Returns the number of
+    users created.
+    """
+    checksum = file_checksum(path)
+    state = db.session.get(SeedState, path)
+    if state is not None and state.checksum == checksum:
+        logger.info("Users file %s unchanged since last seed, skipping", path)
+        return 0
+
+    config = current_app.config
+    rounds = config.get('BCRYPT_LOG_ROUNDS', 12)
+    chunk_size = config.get('SEED_CHUNK_SIZE', 500)
+    pool = None
+    seen = set()
+    created = 0
+    try:
+        for chunk in _chunks(iter_valid_rows(path), chunk_size):
+            emails = {row['email'] for row in chunk}
+            existing = set(db.session.execute(
+                select(User.email).where(User.email.in_(emails))
+            ).scalars())
+
+            new_rows = []
+            for row in chunk:
+                if row['email'] not in existing and row['email'] not in seen:
+                    seen.add(row['email'])
+                    new_rows.append(row)
+            if not new_rows:
+                continue
+
+            passwords = [row['password'] for row in new_rows]
+            if len(new_rows) == 1:
+                hashes = [hash_password(passwords[0], rounds)]
+            else:
+                # bcrypt is the cost here; the pool starts on the first chunk needing it
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=config.get('SEED_HASH_WORKERS'))
+                hashes = list(pool.map(hash_password, passwords, repeat(rounds)))
+
+            db.session.execute(insert(User), [
+                {
+                    'first_name': row['first_name'],
+                    'last_name': row['last_name'],
+                    'email': row['email'],
+                    'password_hash': password_hash,
+                }
+                for row, password_hash in zip(new_rows, hashes)
+            ])
+            created += len(new_rows)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if state is None:
+        db.session.add(SeedState(name=path, checksum=checksum))
+    else:
+        state.checksum = checksum
+    db.session.commit()
+    logger.info("Seeded %s new users from %s", created, path)
+    return created
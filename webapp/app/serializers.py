@@ -0,0 +1,89 @@
+import json
+from functools import lru_cache
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import DateTime
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+
+def dumps(obj):
+    """Compact JSON text, sorted keys like Flask's jsonify"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    jsonify() goes through response(), which always passes ``separators``
+    for compact output or ``indent=2`` in debug; orjson writes both. Dates
+    and other types orjson would format differently go through the default
+    provider's ``default``, so the output matches it.
+    """
+
+    def dumps(self, obj, **kwargs):
+        options = dict(kwargs)
+        options.pop("separators", None)
+        indent = options.pop("indent", None)
+        if orjson is None or options or indent not in (None, 2):
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+        except TypeError:
+            # Non-str keys and anything else only the stdlib encoder accepts
+            return super().dumps(obj, **kwargs)
+
+
+@lru_cache(maxsize=4096)
+def format_datetime(value):
+    """isoformat() memoized, deadlines in particular repeat across rows"""
+    return value.isoformat()
+
+
+class RowSerializer:
+    """Turns SQLAlchemy Row tuples into dicts for a fixed column order.
+
+    Which positions hold datetimes is worked out once from the column
+    types, so per row there is no attribute access or type sniffing.
+    """
+
+    def __init__(self, fields, datetime_fields=()):
+        self.fields = tuple(fields)
+        self.datetime_indexes = tuple(
+            i for i, field in enumerate(self.fields) if field in datetime_fields
+        )
+
+    @classmethod
+    def for_model(cls, model, fields):
+        columns = model.__table__.columns
+        datetime_fields = {
+            field for field in fields if isinstance(columns[field].type, DateTime)
+        }
+        return cls(fields, datetime_fields)
+
+    def __call__(self, row):
+        if self.datetime_indexes:
+            row = list(row)
+            for i in self.datetime_indexes:
+                value = row[i]
+                if value is not None:
+                    row[i] = format_datetime(value)
+        return dict(zip(self.fields, row))
+
+    def many(self, rows):
+        return [self(row) for row in rows]
+
+
+@lru_cache(maxsize=128)
+def row_serializer(model, fields):
+    """Serializer for ``model`` columns ``fields``, built once per projection"""
+    return RowSerializer.for_model(model, fields)
@@ -0,0 +1,92 @@
+"""Micro-benchmark: bytes saved against CPU per response compression level.
+
+    python -m benchmarks.compression_bench --rows 1 10 100 1000
+
+Compresses GET /v1/assignments bodies of --rows assignments, serialized
+as the route does, with every gzip level and brotli quality. Per level it
+reports the compressed size, the share of bytes saved, the CPU time per
+response and how many bytes each millisecond of CPU saves.
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+from app.compression import brotli, encode
+from app.serializers import dumps
+
+LEVELS = {"gzip": range(1, 10), "br": range(0, 12)}
+
+
+def payload(rows):
+    start = datetime(2024, 1, 1)
+    rng = uuid.UUID(int=0)
+    return dumps([
+        {
+            "id": str(uuid.uuid5(rng, str(i))),
+            "name": f"Assignment {i}",
+            "points": i % 100 + 1,
+            "number_of_attempts": i % 5 + 1,
+            "deadline": (start + timedelta(days=30 + i % 60)).isoformat(),
+            "assignment_created": (start + timedelta(seconds=i)).isoformat(),
+            "assignment_updated": (start + timedelta(seconds=i, microseconds=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]).encode("utf-8")
+
+
+def cpu_ms(coding, level, body, min_time=0.2):
+    """Mean process CPU time of one compression, over at least ``min_time``"""
+    runs = 0
+    started = time.process_time()
+    while True:
+        encode(coding, level, body)
+        runs += 1
+        elapsed = time.process_time() - started
+        if elapsed >= min_time:
+            return elapsed / runs * 1000
+
+
+def measure(body, codings):
+    results = []
+    for coding in codings:
+        for level in LEVELS[coding]:
+            size = len(encode(coding, level, body))
+            elapsed_ms = cpu_ms(coding, level, body)
+            saved = len(body) - size
+            results.append({
+                "coding": coding,
+                "level": level,
+                "bytes": size,
+                "saved_pct": round(saved / len(body) * 100, 1),
+                "cpu_ms": round(elapsed_ms, 4),
+                "saved_per_cpu_ms": round(saved / elapsed_ms) if elapsed_ms else None,
+            })
+    return results
+
+
+def report(rows, body, results):
+    lines = [
+        f"\n{rows} rows, {len(body)} bytes uncompressed",
+        f"{'coding':<8}{'level':>6}{'bytes':>10}{'saved':>8}{'cpu ms':>10}{'saved B/cpu ms':>16}",
+    ]
+    for result in results:
+        lines.append(
+            f"{result['coding']:<8}{result['level']:>6}{result['bytes']:>10}"
+            f"{result['saved_pct']:>7.1f}%{result['cpu_ms']:>10.3f}{result['saved_per_cpu_ms']:>16}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    codings = ["gzip"] + (["br"] if brotli is not None else [])
+    for rows in args.rows:
+        body = payload(rows)
+        print(report(rows, body, measure(body, codings)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""HTTP load benchmark: every /v1 route driven concurrently against create_app.
+
+    python -m benchmarks.http_load --requests 5000 --concurrency 16
+    python -m benchmarks.http_load --save-baseline benchmarks/baselines/sqlite.json
+    python -m benchmarks.http_load --baseline benchmarks/baselines/sqlite.json --threshold 0.2
+    python -m benchmarks.http_load --server gevent --db-latency-ms 20 --concurrency 64
+
+Boots the real app on a local database (a fresh SQLite file by default, or
+--database-url, e.g. a Postgres container started with
+``docker run -e POSTGRES_PASSWORD=bench -p 5432:5432 postgres``), seeds
+users, assignments and submissions, and serves it on a threaded local
+server (at most --threads requests in flight, like gunicorn's gthread
+worker) or, with --server gevent, on gevent's WSGI server in
+SERVING_MODE=gevent. Reports throughput and p50/p95/p99 per endpoint. With
+--baseline it exits non-zero when any endpoint's throughput drops, or its
+p95 grows, by more than --threshold.
+
+--db-latency-ms sleeps before every statement to stand in for the network
+round trip to RDS, which a local database does not have. SQLite itself
+blocks the gevent loop, so gevent runs against SQLite should stick to the
+read endpoints (--endpoints list_assignments,get_assignment).
+"""
+import argparse
+import base64
+import json
+import logging
+import math
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from http.client import HTTPConnection
+from uuid import uuid4
+
+PASSWORD = "P@ssw0rd"
+ENDPOINTS = {
+    # name: (weight, method, path template)
+    "list_assignments": (20, "GET", "/v1/assignments"),
+    "get_assignment": (40, "GET", "/v1/assignments/{id}"),
+    "create_assignment": (8, "POST", "/v1/assignments"),
+    "create_assignments_bulk": (2, "POST", "/v1/assignments/bulk"),
+    "update_assignment": (8, "PUT", "/v1/assignments/{id}"),
+    "delete_assignment": (4, "DELETE", "/v1/assignments/{id}"),
+    "create_submission": (18, "POST", "/v1/assigments/{id}/submission"),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, duration):
+    """{endpoint: stats} from {endpoint: [(latency_ms, ok)]}"""
+    results = {}
+    for name, endpoint_samples in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in endpoint_samples)
+        results[name] = {
+            "requests": len(endpoint_samples),
+            "errors": sum(1 for _, ok in endpoint_samples if not ok),
+            "throughput_rps": round(len(endpoint_samples) / duration, 2),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regressions of ``results`` against ``baseline`` beyond ``threshold``"""
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} < baseline {base['throughput_rps']}"
+            )
+        if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > baseline {base['p95_ms']} ms")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors > baseline {base['errors']}")
+    return regressions
+
+
+def boot(database_url, serving_mode="sync"):
+    from config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SERVING_MODE = serving_mode
+        BCRYPT_LOG_ROUNDS = 4
+        BOOT_MODE = "full"
+        OUTBOX_DISPATCHER_ENABLED = False
+        # BENCH_ASSIGNMENT_CACHE_BACKEND=none measures reads without the cache
+        ASSIGNMENT_CACHE_BACKEND = os.getenv("BENCH_ASSIGNMENT_CACHE_BACKEND", "local")
+
+    from app import create_app, extension
+
+    app = create_app(BenchConfig)
+    # Submissions write their outbox row as in production, nothing is published
+    extension.sns_topic_arn = "arn:aws:sns:us-east-1:000000000000:bench"
+    return app
+
+
+def add_db_latency(app, latency_ms):
+    """Sleep before every statement, a stand-in for the database round trip"""
+    from sqlalchemy import event
+    from app.extension import db
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def wait(*args):
+        time.sleep(latency_ms / 1000)
+
+
+class PooledWSGIServer:
+    """Local server handling at most ``threads`` requests at a time.
+
+    Connections are closed after each response so, as with gunicorn's
+    gthread worker, an idle keep-alive client never holds a thread.
+    """
+
+    def __init__(self, app, threads):
+        from werkzeug.serving import BaseWSGIServer
+
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="bench-server")
+        pool = self.pool
+
+        class Server(BaseWSGIServer):
+            def process_request(self, request, client_address):
+                pool.submit(self._handle, request, client_address)
+
+            def _handle(self, request, client_address):
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+
+        self.server = Server("127.0.0.1", 0, app)
+        self.port = self.server.server_port
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.pool.shutdown(wait=False)
+
+
+def serve(app, server, threads):
+    """Serve ``app`` on a free local port, returning (port, stop)"""
+    if server == "gevent":
+        from gevent.pywsgi import WSGIHandler, WSGIServer
+
+        class Handler(WSGIHandler):
+            def handle(self):
+                # Headers and body are separate writes, Nagle would hold the body
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                super().handle()
+
+        httpd = WSGIServer(("127.0.0.1", 0), app, handler_class=Handler, log=None)
+        httpd.start()
+        return httpd.server_port, httpd.stop
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    if threads:
+        WSGIRequestHandler.protocol_version = "HTTP/1.0"
+        httpd = PooledWSGIServer(app, threads)
+        httpd.start()
+        return httpd.port, httpd.stop
+
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    httpd = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd.server_port, httpd.shutdown
+
+
+def seed(app, users, assignments, submissions):
+    """Bench users, each owning ``assignments`` assignments with submissions"""
+    from sqlalchemy import insert
+    from app.extension import db, hashing_pool
+    from app.models import Assignment, Submission, User
+
+    now = datetime.utcnow()
+    with app.app_context():
+        password_hash = hashing_pool.generate_password_hash(PASSWORD).decode("utf-8")
+        emails = [f"bench{i}-{uuid4().hex[:8]}@example.com" for i in range(users)]
+        db.session.execute(insert(User), [
+            {"first_name": "Bench", "last_name": str(i), "email": email, "password_hash": password_hash}
+            for i, email in enumerate(emails)
+        ])
+        user_ids = dict(db.session.query(User.email, User.id).filter(User.email.in_(emails)).all())
+
+        owned = {email: [] for email in emails}
+        rows = []
+        for email in emails:
+            for i in range(assignments):
+                assignment_id = str(uuid4())
+                owned[email].append(assignment_id)
+                rows.append({
+                    "id": assignment_id, "name": f"bench {i}", "points": 10,
+                    "number_of_attempts": 1_000_000,
+                    "deadline": now + timedelta(days=365),
+                    "assignment_created": now, "assignment_updated": now,
+                    "created_by": user_ids[email],
+                })
+        db.session.execute(insert(Assignment), rows)
+        db.session.execute(insert(Submission), [
+            {"assignment_id": row["id"], "user_id": row["created_by"],
+             "submission_url": "https://example.com/bench.zip",
+             "submission_date": now, "assignment_updated": now}
+            for row in rows for _ in range(submissions)
+        ])
+        db.session.commit()
+    return owned
+
+
+class Worker:
+    """One client connection issuing a weighted, seeded mix of requests"""
+
+    def __init__(self, port, email, owned, rng, endpoints=None):
+        self.port = port
+        self.rng = rng
+        self.owned = owned
+        self.deletable = []
+        token = base64.b64encode(f"{email}:{PASSWORD}".encode()).decode()
+        self.headers = {"Authorization": f"Basic {token}", "Content-Type": "application/json"}
+        self.names = list(endpoints or ENDPOINTS)
+        self.weights = [ENDPOINTS[name][0] for name in self.names]
+
+    def _assignment(self, deadline_days=30):
+        return {
+            "name": "bench", "points": 5, "number_of_attempts": 3,
+            "deadline": (datetime.utcnow() + timedelta(days=deadline_days)).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        }
+
+    def _request(self, name):
+        _, method, template = ENDPOINTS[name]
+        body = None
+        # Updates and deletes only touch assignments this worker created: the
+        # seeded ones keep their attempt limit, so submissions never run out
+        if name in ("delete_assignment", "update_assignment") and not self.deletable:
+            name, method, template = "create_assignment", "POST", ENDPOINTS["create_assignment"][2]
+        if name == "delete_assignment":
+            return name, method, template.format(id=self.deletable.pop()), None
+        if name == "update_assignment":
+            return name, method, template.format(id=self.rng.choice(self.deletable)), self._assignment(deadline_days=60)
+        if name == "create_assignment":
+            body = self._assignment()
+        elif name == "create_assignments_bulk":
+            body = [self._assignment() for _ in range(10)]
+        elif name == "create_submission":
+            body = {"submission_url": "https://example.com/bench.zip"}
+        return name, method, template.format(id=self.rng.choice(self.owned)), body
+
+    def run(self, count):
+        samples = []
+        connection = HTTPConnection("127.0.0.1", self.port, timeout=30)
+        try:
+            for _ in range(count):
+                name, method, path, body = self._request(
+                    self.rng.choices(self.names, self.weights)[0]
+                )
+                payload = json.dumps(body) if body is not None else None
+                started = time.perf_counter()
+                connection.request(method, path, body=payload, headers=self.headers)
+                response = connection.getresponse()
+                data = response.read()
+                latency_ms = (time.perf_counter() - started) * 1000
+                ok = response.status < 400
+                samples.append((name, latency_ms, ok))
+                if name == "create_assignment" and response.status == 201:
+                    self.deletable.append(json.loads(data)["id"])
+        finally:
+            connection.close()
+        return samples
+
+
+def run(args):
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="webapp-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+
+    app = boot(database_url, "gevent" if args.server == "gevent" else "sync")
+    for name in (None, "werkzeug"):
+        logging.getLogger(name).setLevel(args.log_level)
+    owned = seed(app, args.users, args.assignments, args.submissions)
+    if args.db_latency_ms:
+        add_db_latency(app, args.db_latency_ms)
+
+    port, stop = serve(app, args.server, args.threads)
+
+    emails = list(owned)
+    workers = [
+        Worker(port, emails[i % len(emails)], owned[emails[i % len(emails)]],
+               random.Random(args.seed + i), args.endpoints)
+        for i in range(args.concurrency)
+    ]
+    per_worker = max(args.requests // args.concurrency, 1)
+
+    # Warm up auth caches and connections outside the measured window
+    for worker in workers:
+        worker.run(2)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        batches = list(pool.map(lambda worker: worker.run(per_worker), workers))
+    duration = time.perf_counter() - started
+    stop()
+
+    samples = {}
+    for batch in batches:
+        for name, latency_ms, ok in batch:
+            samples.setdefault(name, []).append((latency_ms, ok))
+    return summarize(samples, duration), duration
+
+
+def report(results, duration):
+    lines = [f"{'endpoint':<26}{'requests':>9}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+    for name, stats in results.items():
+        lines.append(
+            f"{name:<26}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+        )
+    total = sum(stats["requests"] for stats in results.values())
+    lines.append(f"\n{total} requests in {duration:.2f}s, {total / duration:.1f} req/s")
+    return "\n".join(lines)
+
+
+def parse_endpoints(value):
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(ENDPOINTS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown endpoints: {', '.join(unknown)}")
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file")
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--assignments", type=int, default=50, help="per user")
+    parser.add_argument("--submissions", type=int, default=2, help="per assignment")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server", choices=("threaded", "gevent"), default="threaded")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="threaded server's request threads, 0 for one per connection")
+    parser.add_argument("--db-latency-ms", type=float, default=0,
+                        help="added before every statement")
+    parser.add_argument("--endpoints", type=parse_endpoints, help="comma separated, defaults to all")
+    parser.add_argument("--log-level", default="WARNING", help="app log level while measuring")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.server == "gevent":
+        # As gunicorn -k gevent does, before the app or its drivers load
+        from gevent import monkey
+        monkey.patch_all()
+
+    results, duration = run(args)
+    print(report(results, duration))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print("\nRegressions beyond {:.0%}:".format(args.threshold))
+            print("\n".join(f"  {line}" for line in regressions))
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Per-module import time of the webapp, from ``python -X importtime``.
+
+    python -m benchmarks.import_time --top 20 --budget-ms 1500
+
+Each import runs in a fresh interpreter so nothing is already cached in
+sys.modules. Exits non-zero when the total is over the budget.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+WEBAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
+
+
+def measure(module="app"):
+    """Return [(name, self_us, cumulative_us)] for every module imported"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=WEBAPP_DIR, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def total_ms(entries, module="app"):
+    return next(cumulative for name, _, cumulative in entries if name == module) / 1000
+
+
+def report(entries, top=20):
+    lines = [f"{'cumulative ms':>14} {'self ms':>9}  module"]
+    for name, self_us, cumulative_us in sorted(entries, key=lambda e: -e[2])[:top]:
+        lines.append(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    entries = measure(args.module)
+    print(report(entries, args.top))
+    total = total_ms(entries, args.module)
+    print(f"\nimport {args.module}: {total:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
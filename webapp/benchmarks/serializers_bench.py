@@ -0,0 +1,91 @@
+"""Micro-benchmark: ORM serialize() + jsonify vs Row tuples + RowSerializer.
+
+The baseline encodes with Flask's default provider, the row path with the
+app's FastJSONProvider, both through response() as jsonify does.
+
+    python -m benchmarks.serializers_bench --rows 10000 100000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from flask import Flask, current_app
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert, select
+from app.extension import db
+from app.models import User, Assignment
+from app.pagination import ASSIGNMENT_FIELDS
+from app.serializers import FastJSONProvider, orjson, row_serializer
+
+
+def seed(count):
+    db.session.execute(insert(User), [{
+        "id": 1, "first_name": "Bench", "last_name": "User",
+        "email": "bench@example.com", "password_hash": "x",
+    }])
+    start = datetime(2024, 1, 1)
+    db.session.execute(insert(Assignment), [
+        {
+            "id": f"{i:036d}",
+            "name": f"assignment {i}",
+            "points": i % 100 + 1,
+            "number_of_attempts": i % 5 + 1,
+            "deadline": start + timedelta(days=i % 30),
+            "assignment_created": start + timedelta(seconds=i),
+            "assignment_updated": start + timedelta(seconds=i, microseconds=i),
+            "created_by": 1,
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def orm_path(provider):
+    assignments = Assignment.query.all()
+    return provider.response([assignment.serialize() for assignment in assignments]).get_data()
+
+
+def row_path():
+    columns = [getattr(Assignment, field) for field in ASSIGNMENT_FIELDS]
+    rows = db.session.execute(select(*columns)).all()
+    return current_app.json.response(row_serializer(Assignment, ASSIGNMENT_FIELDS).many(rows)).get_data()
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(count, repeat):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.json = FastJSONProvider(app)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        seed(count)
+        provider = DefaultJSONProvider(app)
+        orm = best_of(lambda: orm_path(provider), repeat)
+        rows = best_of(row_path, repeat)
+    print(
+        f"{count:>8} rows  orm+jsonify {count / orm:>10,.0f} rows/s  "
+        f"row serializer {count / rows:>10,.0f} rows/s  speedup x{orm / rows:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"JSON backend: {'orjson' if orjson else 'stdlib json'}")
+    for count in args.rows:
+        run(count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Concurrent capacity of SERVING_MODE=sync against SERVING_MODE=gevent.
+
+    python -m benchmarks.serving_capacity --threads 4 --concurrency 4,16,64 --db-latency-ms 20
+
+Runs benchmarks.http_load once per serving mode and client count, each in
+its own process since gevent's monkey patching is process wide. The sync
+server gets --threads request threads (a gthread worker's budget on a
+t2.micro), the gevent server a greenlet per connection. Both share the
+--database-url pool settings and the simulated --db-latency-ms, and the
+assignment cache is off so every read reaches the database.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+READ_ENDPOINTS = "list_assignments,get_assignment"
+MODES = {
+    "sync": lambda threads: ["--server", "threaded", "--threads", str(threads)],
+    "gevent": lambda threads: ["--server", "gevent"],
+}
+
+
+def totals(results):
+    """Overall req/s and the worst endpoint p95 of one http_load run"""
+    return (
+        round(sum(stats["throughput_rps"] for stats in results.values()), 1),
+        max(stats["p95_ms"] for stats in results.values()),
+    )
+
+
+def measure(mode, concurrency, args):
+    with tempfile.TemporaryDirectory(prefix="webapp-capacity-") as tmp:
+        out = os.path.join(tmp, "results.json")
+        command = [
+            sys.executable, "-m", "benchmarks.http_load",
+            *MODES[mode](args.threads),
+            "--concurrency", str(concurrency),
+            "--requests", str(args.requests_per_client * concurrency),
+            "--db-latency-ms", str(args.db_latency_ms),
+            "--endpoints", args.endpoints,
+            "--save-baseline", out,
+        ]
+        if args.database_url:
+            command += ["--database-url", args.database_url]
+        env = dict(os.environ, BENCH_ASSIGNMENT_CACHE_BACKEND="none")
+        subprocess.run(
+            command, check=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        with open(out) as file:
+            return totals(json.load(file))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="defaults to a fresh SQLite file per run")
+    parser.add_argument("--threads", type=int, default=4, help="sync request threads")
+    parser.add_argument("--concurrency", default="4,16,64", help="comma separated client counts")
+    parser.add_argument("--requests-per-client", type=int, default=20)
+    parser.add_argument("--db-latency-ms", type=float, default=20)
+    parser.add_argument("--endpoints", default=READ_ENDPOINTS,
+                        help="the full mix needs --database-url, SQLite writes block gevent")
+    args = parser.parse_args()
+
+    print(f"{'clients':>8}{'sync req/s':>12}{'sync p95':>10}{'gevent req/s':>14}{'gevent p95':>12}{'gain':>7}")
+    for concurrency in (int(value) for value in args.concurrency.split(",")):
+        sync_rps, sync_p95 = measure("sync", concurrency, args)
+        gevent_rps, gevent_p95 = measure("gevent", concurrency, args)
+        print(
+            f"{concurrency:>8}{sync_rps:>12.1f}{sync_p95:>10.1f}{gevent_rps:>14.1f}{gevent_p95:>12.1f}"
+            f"{gevent_rps / sync_rps:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Micro-benchmark: compiled schema validators vs the previous ad hoc helpers.
+
+    python -m benchmarks.validation_bench --number 100000
+"""
+import argparse
+import re
+import timeit
+from datetime import datetime
+from app.helper_func import is_valid_email, is_valid_password
+from app.schema import ASSIGNMENT_SCHEMA
+
+PAYLOAD = {
+    "name": "Assignment 1",
+    "points": 10,
+    "number_of_attempts": 3,
+    "deadline": "2030-01-01T00:00:00.000Z",
+}
+
+
+# The helpers as they were before the schema layer, kept here for comparison
+def legacy_is_valid_email(email):
+    pattern = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+    return re.match(pattern, email) is not None
+
+
+def legacy_is_valid_password(password):
+    if len(password) < 6:
+        return False
+    if not any(char.isdigit() for char in password):
+        return False
+    if not any(char.isupper() for char in password):
+        return False
+    if not any(char.islower() for char in password):
+        return False
+    if not any(char in '!@#$%^&*()' for char in password):
+        return False
+    return True
+
+
+def legacy_validate_datetime_format(dt_str):
+    try:
+        return True, datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S.%fZ")
+    except ValueError:
+        return False, None
+
+
+def legacy_validate_assignment(data):
+    if not isinstance(data, dict):
+        return None, "Assignment must be a JSON object"
+    name = data.get("name")
+    points = data.get("points")
+    number_of_attempts = data.get("number_of_attempts")
+    deadline = data.get("deadline")
+    if not all([name, points, number_of_attempts, deadline]):
+        return None, "Missing required fields"
+    if not isinstance(points, int) or not (1 <= points <= 100):
+        return None, "Points must between 1 and 100"
+    if not isinstance(number_of_attempts, int) or not (1 <= number_of_attempts <= 100):
+        return None, "No of attempts must between 1 and 100"
+    valid_flag, processed_deadline = legacy_validate_datetime_format(deadline)
+    if not valid_flag:
+        return None, "Invalid Deadline format"
+    return {
+        "name": name, "points": points,
+        "number_of_attempts": number_of_attempts, "deadline": processed_deadline,
+    }, None
+
+
+CASES = [
+    ("email", lambda: legacy_is_valid_email("nihal.gajbhiye@gmail.com"),
+     lambda: is_valid_email("nihal.gajbhiye@gmail.com")),
+    ("password", lambda: legacy_is_valid_password("P@ssw0rd"),
+     lambda: is_valid_password("P@ssw0rd")),
+    ("assignment", lambda: legacy_validate_assignment(PAYLOAD),
+     lambda: ASSIGNMENT_SCHEMA.validate(PAYLOAD)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for name, legacy, compiled in CASES:
+        old = min(timeit.repeat(legacy, number=args.number, repeat=args.repeat)) / args.number
+        new = min(timeit.repeat(compiled, number=args.number, repeat=args.repeat)) / args.number
+        print(f"{name:<12} legacy {old * 1e6:>7.2f} us  compiled {new * 1e6:>7.2f} us  speedup x{old / new:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -20,5 +21,113 @@ class Config:
     DB_NAME = os.getenv("DATABASE_NAME")
     SQLALCHEMY_DATABASE_URI = f'postgresql://{DB_USER}:{DB_PASSWORD}@{HOST_NAME}:5432/{DB_NAME}'
 
+    # Optional read replica for the read-only routes, either a full URI or a
+    # host sharing the primary's credentials and database. /healthz follows the
+    # primary; reads fall back to it while the replica's probe fails
+    DB_REPLICA_HOST = os.getenv("DATABASE_REPLICA_HOST")
+    SQLALCHEMY_REPLICA_URI = os.getenv("SQLALCHEMY_REPLICA_URI") or (
+        f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_REPLICA_HOST}:5432/{DB_NAME}' if DB_REPLICA_HOST else None
+    )
+    SQLALCHEMY_BINDS = {"replica": SQLALCHEMY_REPLICA_URI} if SQLALCHEMY_REPLICA_URI else {}
+    # Clients are read from the primary this long after a successful write,
+    # pinned by a cookie they send back
+    REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+    # "sync": one thread per in-flight request. "gevent": one greenlet per
+    # request under gunicorn -k gevent, waits on Postgres and SNS yield
+    SERVING_MODE = os.getenv("SERVING_MODE", "sync")
+
+    # gunicorn.conf.py, worker and thread counts of 0 are autotuned from the
+    # CPUs and the available memory at SERVER_WORKER_MEMORY_MB per worker
+    SERVER_BIND = os.getenv("SERVER_BIND", "0.0.0.0:8000")
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 0))
+    SERVER_THREADS = int(os.getenv("SERVER_THREADS", 0))
+    SERVER_WORKER_MEMORY_MB = int(os.getenv("SERVER_WORKER_MEMORY_MB", 150))
+    SERVER_WORKER_CONNECTIONS = int(os.getenv("SERVER_WORKER_CONNECTIONS", 500))
+    SERVER_PRELOAD = os.getenv("SERVER_PRELOAD", "true").lower() == "true"
+    SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", 5000))
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 500))
+    SERVER_TIMEOUT = int(os.getenv("SERVER_TIMEOUT", 30))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", 30))
+    SERVER_KEEPALIVE = int(os.getenv("SERVER_KEEPALIVE", 5))
+    SERVER_ACCESS_LOG = os.getenv("SERVER_ACCESS_LOG", "")
+    SERVER_LOG_LEVEL = os.getenv("SERVER_LOG_LEVEL", "info")
+
+    # Engine pool, sized per gunicorn worker against the RDS connection limit
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))
+
+    # Logging: "text" or compact "json" lines, bounded queue, e.g. INFO=0.1 sampling
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+    SNS_TOPIC_ARN = os.getenv("SNS_TOPIC_ARN")
+    AWS_PROFILE_NAME = os.getenv("AWS_PROFILE_NAME")
+
+    # Verified Basic Auth credentials cache
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 1024))
+    AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 300))
+    AUTH_CACHE_SECRET = os.getenv("AUTH_CACHE_SECRET")
+
+    # Bounded bcrypt pool, requests beyond workers + queue depth get a 503
+    HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", 2))
+    HASH_POOL_QUEUE_DEPTH = int(os.getenv("HASH_POOL_QUEUE_DEPTH", 32))
+    HASH_POOL_TIMEOUT = float(os.getenv("HASH_POOL_TIMEOUT", 10))
+
+    # GET /v1/assignments keyset pagination
+    ASSIGNMENTS_PAGE_SIZE = int(os.getenv("ASSIGNMENTS_PAGE_SIZE", 100))
+    ASSIGNMENTS_MAX_PAGE_SIZE = int(os.getenv("ASSIGNMENTS_MAX_PAGE_SIZE", 1000))
+    ASSIGNMENTS_STREAM_BATCH_SIZE = int(os.getenv("ASSIGNMENTS_STREAM_BATCH_SIZE", 1000))
+    ASSIGNMENTS_BULK_MAX = int(os.getenv("ASSIGNMENTS_BULK_MAX", 1000))
+
+    # Read-through assignment cache: "local" (per worker LRU), "redis" or "none".
+    # Only redis sees other workers' invalidations, a local entry can be a TTL
+    # stale; submissions check the deadline and attempts against the row
+    ASSIGNMENT_CACHE_BACKEND = os.getenv("ASSIGNMENT_CACHE_BACKEND", "local")
+    ASSIGNMENT_CACHE_URL = os.getenv("ASSIGNMENT_CACHE_URL", "redis://localhost:6379/0")
+    ASSIGNMENT_CACHE_SIZE = int(os.getenv("ASSIGNMENT_CACHE_SIZE", 1024))
+    ASSIGNMENT_CACHE_TTL = int(os.getenv("ASSIGNMENT_CACHE_TTL", 30))
+
+    # /healthz reads a cached SELECT 1 refreshed every interval seconds
+    HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", 5))
+    HEALTH_PROBE_MAX_AGE = float(os.getenv("HEALTH_PROBE_MAX_AGE", 15))
+
+    # Transactional outbox drained to SNS with PublishBatch
+    OUTBOX_DISPATCHER_ENABLED = os.getenv("OUTBOX_DISPATCHER_ENABLED", "true").lower() == "true"
+    OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 5))
+    OUTBOX_FETCH_SIZE = int(os.getenv("OUTBOX_FETCH_SIZE", 100))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+    OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", 1))
+    OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", 300))
+
+    # JSON responses compressed per Accept-Encoding, "br,gzip" in server
+    # preference order; bodies under COMPRESSION_MIN_SIZE bytes go out as is.
+    # Levels from benchmarks.compression_bench: higher ones add CPU, not savings
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_ALGORITHMS = os.getenv("COMPRESSION_ALGORITHMS", "br,gzip")
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 5))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 3))
+
+    # Opt-in per-request SQL profiling, Server-Timing header and slow-request log
+    SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() == "true"
+    SQL_PROFILER_SLOW_REQUEST_MS = float(os.getenv("SQL_PROFILER_SLOW_REQUEST_MS", 500))
+    SQL_PROFILER_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILER_REPEAT_THRESHOLD", 5))
+    SQL_PROFILER_TOP_N = int(os.getenv("SQL_PROFILER_TOP_N", 3))
+
+    # login.csv seeding, new passwords hashed across processes (default one per CPU)
+    SEED_CHUNK_SIZE = int(os.getenv("SEED_CHUNK_SIZE", 500))
+    SEED_HASH_WORKERS = int(os.getenv("SEED_HASH_WORKERS", 0)) or None
+
+    # "fast" skips seeding when the database is at the migration head, "full"
+    # always reseeds; the marker caches what this host verified
+    BOOT_MODE = os.getenv("BOOT_MODE", "fast")
+    BOOT_MARKER_PATH = os.getenv("BOOT_MARKER_PATH", os.path.join(tempfile.gettempdir(), "webapp-boot.json"))
+
 
     
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""gunicorn settings for production, picked up from the working directory:
+
+    gunicorn                  # serves wsgi:app
+    kill -HUP <master pid>    # graceful reload
+
+Worker and thread counts are autotuned by serving.py unless SERVER_WORKERS
+or SERVER_THREADS are set. HUP starts new workers and lets the old ones
+finish in-flight requests within graceful_timeout. A preloaded app is not
+re-imported on HUP, so deploys restart the service.
+"""
+from config import Config
+from serving import pss_mb, rss_mb, server_settings
+
+_settings = server_settings(Config)
+
+wsgi_app = "wsgi:app"
+bind = _settings["bind"]
+worker_class = _settings["worker_class"]
+workers = _settings["workers"]
+threads = _settings["threads"]
+worker_connections = _settings["worker_connections"]
+# The app is built once in the master, workers share its pages copy-on-write
+preload_app = _settings["preload_app"]
+# Recycle workers to bound slow leaks, jittered so they do not restart together
+max_requests = _settings["max_requests"]
+max_requests_jitter = _settings["max_requests_jitter"]
+timeout = _settings["timeout"]
+graceful_timeout = _settings["graceful_timeout"]
+keepalive = _settings["keepalive"]
+accesslog = _settings["accesslog"]
+errorlog = "-"
+loglevel = _settings["loglevel"]
+
+
+def when_ready(server):
+    # Effective values, after any command line overrides
+    effective = {
+        name: server.cfg.settings[name].value if name in server.cfg.settings else value
+        for name, value in _settings.items()
+    }
+    server.log.info(
+        "Serving with %s", " ".join(f"{name}={value}" for name, value in effective.items())
+    )
+    server.log.info("Master RSS %s MB", rss_mb())
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        # Pooled connections opened while booting in the master must not be
+        # shared by the workers, each opens its own
+        from app.extension import db
+
+        with server.app.wsgi().app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # PSS splits pages still shared copy-on-write with the master between them
+    worker.log.info("Worker %s ready, RSS %s MB, PSS %s MB", worker.pid, rss_mb(), pss_mb())
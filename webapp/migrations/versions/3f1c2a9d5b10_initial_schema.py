@@ -0,0 +1,60 @@
+"""initial schema
+
+Databases created by db.create_all() before migrations were added already
+match this revision; upgrade.py stamps them at it once, then upgrades.
+
+Revision ID: 3f1c2a9d5b10
+Revises: 
+Create Date: 2026-10-17 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d5b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(length=50), nullable=False),
+    sa.Column('last_name', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=128), nullable=False),
+    sa.Column('account_created', sa.DateTime(), nullable=True),
+    sa.Column('account_updated', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('assignment',
+    sa.Column('id', sa.String(length=100), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('number_of_attempts', sa.Integer(), nullable=False),
+    sa.Column('deadline', sa.DateTime(), nullable=False),
+    sa.Column('assignment_created', sa.DateTime(), nullable=False),
+    sa.Column('assignment_updated', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('submission',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('assignment_id', sa.String(), nullable=False),
+    sa.Column('submission_url', sa.String(length=200), nullable=False),
+    sa.Column('Submission_date', sa.DateTime(), nullable=True),
+    sa.Column('assignment_updated', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignment.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('submission')
+    op.drop_table('assignment')
+    op.drop_table('user')
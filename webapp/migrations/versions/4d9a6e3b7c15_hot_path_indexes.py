@@ -0,0 +1,38 @@
+"""indexes for the hot assignment lookups
+
+Revision ID: 4d9a6e3b7c15
+Revises: e5b81f0c9a27
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d9a6e3b7c15'
+down_revision = 'e5b81f0c9a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    # CONCURRENTLY keeps the table writable while the indexes build on RDS,
+    # it cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index('ix_assignment_created_id', 'assignment', ['assignment_created', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_assignment_updated', 'assignment', ['assignment_updated'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_assignment_created_by_deadline', 'assignment', ['created_by', 'deadline'], unique=False, postgresql_concurrently=True)
+        if postgresql:
+            op.create_index('ix_assignment_id_updated', 'assignment', ['id'], unique=False, postgresql_include=['assignment_updated'], postgresql_concurrently=True)
+
+
+def downgrade():
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        if postgresql:
+            op.drop_index('ix_assignment_id_updated', table_name='assignment', postgresql_concurrently=True)
+        op.drop_index('ix_assignment_created_by_deadline', table_name='assignment', postgresql_concurrently=True)
+        op.drop_index('ix_assignment_updated', table_name='assignment', postgresql_concurrently=True)
+        op.drop_index('ix_assignment_created_id', table_name='assignment', postgresql_concurrently=True)
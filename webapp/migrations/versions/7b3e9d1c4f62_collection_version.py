@@ -0,0 +1,34 @@
+"""version counter for the assignments collection ETag
+
+Revision ID: 7b3e9d1c4f62
+Revises: 4d9a6e3b7c15
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9d1c4f62'
+down_revision = '4d9a6e3b7c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    collection_version = op.create_table('collection_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(collection_version, [{'name': 'assignment', 'version': 0}])
+    # The ETag no longer reads max(assignment_updated)
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_assignment_updated', table_name='assignment', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_assignment_updated', 'assignment', ['assignment_updated'], unique=False, postgresql_concurrently=True)
+    op.drop_table('collection_version')
@@ -0,0 +1,40 @@
+"""per user submission attempt accounting
+
+Revision ID: 8a4e7c2f1d36
+Revises: 3f1c2a9d5b10
+Create Date: 2026-10-17 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e7c2f1d36'
+down_revision = '3f1c2a9d5b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('submission_attempt',
+    sa.Column('assignment_id', sa.String(length=100), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignment.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('assignment_id', 'user_id')
+    )
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_submission_user_id_user', 'user', ['user_id'], ['id'])
+        batch_op.create_index('ix_submission_assignment_user', ['assignment_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('submission', schema=None) as batch_op:
+        batch_op.drop_index('ix_submission_assignment_user')
+        batch_op.drop_constraint('fk_submission_user_id_user', type_='foreignkey')
+        batch_op.drop_column('user_id')
+
+    op.drop_table('submission_attempt')
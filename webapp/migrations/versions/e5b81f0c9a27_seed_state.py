@@ -0,0 +1,29 @@
+"""checksum of the last seeded users file
+
+Revision ID: e5b81f0c9a27
+Revises: c27d9e4b6a81
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b81f0c9a27'
+down_revision = 'c27d9e4b6a81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seed_state',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('seeded_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('seed_state')
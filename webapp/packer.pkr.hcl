@@ -162,8 +162,15 @@ build {
             "Group=www-data",
             "WorkingDirectory=${var.app_dir}",
             "Environment=PATH=${var.app_dir}/env/bin",
-            "ExecStart=${var.app_dir}/env/bin/gunicorn --bind 0.0.0.0:8000 wsgi:app",
-            "Restart=on=failure",
+            # Migrations run once per start, before any worker boots; index
+            # builds on a large table can outlast the default 90s start timeout
+            "ExecStartPre=${var.app_dir}/env/bin/python upgrade.py",
+            "TimeoutStartSec=600",
+            "ExecStart=${var.app_dir}/env/bin/gunicorn --config gunicorn.conf.py",
+            # HUP: new workers start, old ones finish in-flight requests. The
+            # escapes survive both shells so the unit reads $MAINPID
+            "ExecReload=/bin/kill -s HUP \\\\\\$MAINPID",
+            "Restart=on-failure",
             "RestartSec=1s",
             "",
             "[Install]",
@@ -0,0 +1,93 @@
+"""Production server settings for gunicorn.conf.py, autotuned from the host.
+
+Only the standard library is imported here: under the gevent worker
+nothing from the app may load before gunicorn has monkey patched.
+"""
+import os
+
+# SERVING_MODE to gunicorn worker class
+WORKER_CLASSES = {"sync": "gthread", "gevent": "gevent"}
+
+
+def cpu_count():
+    """CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _proc_kb(path, field):
+    try:
+        with open(path) as file:
+            for line in file:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def available_memory_mb(meminfo="/proc/meminfo"):
+    """MemAvailable in MB, or None where /proc is missing"""
+    kb = _proc_kb(meminfo, "MemAvailable:")
+    return None if kb is None else kb // 1024
+
+
+def rss_mb(pid="self"):
+    """Resident set size of ``pid`` in MB, or None where /proc is missing"""
+    kb = _proc_kb(f"/proc/{pid}/status", "VmRSS:")
+    return None if kb is None else round(kb / 1024, 1)
+
+
+def pss_mb(pid="self"):
+    """Proportional set size of ``pid`` in MB, or None where unsupported"""
+    kb = _proc_kb(f"/proc/{pid}/smaps_rollup", "Pss:")
+    return None if kb is None else round(kb / 1024, 1)
+
+
+def autotune(mode, cpus, memory_mb, worker_memory_mb, db_pool_size):
+    """(workers, threads): enough workers for the CPUs, as many as fit in memory.
+
+    gthread workers mostly wait on the database, so 2 * cpus + 1 of them
+    with one thread per pooled connection. A gevent worker multiplexes
+    its connections on one loop, so one per CPU.
+    """
+    if mode == "gevent":
+        workers, threads = cpus, 1
+    else:
+        workers, threads = 2 * cpus + 1, max(db_pool_size, 1)
+    if memory_mb is not None:
+        workers = min(workers, memory_mb // worker_memory_mb)
+    return max(workers, 1), threads
+
+
+def server_settings(config, cpus=None, memory_mb=None):
+    """gunicorn settings from the SERVER_* config, explicit counts win"""
+    mode = config.SERVING_MODE
+    if mode not in WORKER_CLASSES:
+        raise ValueError(f"Unknown SERVING_MODE: {mode}")
+    cpus = cpus or cpu_count()
+    if memory_mb is None:
+        memory_mb = available_memory_mb()
+    workers, threads = autotune(
+        mode, cpus, memory_mb, config.SERVER_WORKER_MEMORY_MB, config.DB_POOL_SIZE
+    )
+    return {
+        "bind": config.SERVER_BIND,
+        "worker_class": WORKER_CLASSES[mode],
+        "workers": config.SERVER_WORKERS or workers,
+        "threads": config.SERVER_THREADS or threads,
+        "worker_connections": config.SERVER_WORKER_CONNECTIONS,
+        # gevent has to patch before the app is imported, so it cannot preload
+        "preload_app": config.SERVER_PRELOAD and mode != "gevent",
+        "max_requests": config.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": config.SERVER_MAX_REQUESTS_JITTER,
+        "timeout": config.SERVER_TIMEOUT,
+        "graceful_timeout": config.SERVER_GRACEFUL_TIMEOUT,
+        "keepalive": config.SERVER_KEEPALIVE,
+        "accesslog": config.SERVER_ACCESS_LOG or None,
+        "loglevel": config.SERVER_LOG_LEVEL,
+        "cpus": cpus,
+        "available_memory_mb": memory_mb,
+    }
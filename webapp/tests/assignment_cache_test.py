@@ -0,0 +1,60 @@
+from app.cache import ReadThroughCache, LocalCacheBackend, RedisCacheBackend
+
+
+class FakeRedis:
+    """Local stand-in for the few Redis commands the backend uses"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+def _check_read_through(cache):
+    loads = []
+
+    def loader(key):
+        loads.append(key)
+        return {"assignment": {"id": key}, "created_by": 1} if key != "missing" else None
+
+    assert cache.get("a1", loader)["assignment"]["id"] == "a1"
+    assert cache.get("a1", loader)["created_by"] == 1
+    assert loads == ["a1"]
+
+    cache.invalidate("a1")
+    cache.get("a1", loader)
+    assert loads == ["a1", "a1"]
+
+    assert cache.get("missing", loader) is None
+    assert cache.get("missing", loader) is None
+    assert loads.count("missing") == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_local_backend_read_through():
+    _check_read_through(ReadThroughCache("assignment", backend=LocalCacheBackend()))
+
+
+def test_redis_backend_read_through():
+    redis = FakeRedis()
+    _check_read_through(ReadThroughCache("assignment", backend=RedisCacheBackend(redis)))
+    assert list(redis.store) == ["webapp:a1"]
+
+
+def test_backend_errors_fall_back_to_loader():
+    class BrokenBackend:
+        def get(self, key):
+            raise ConnectionError("down")
+
+        def set(self, key, value):
+            raise ConnectionError("down")
+
+    cache = ReadThroughCache("assignment", backend=BrokenBackend())
+    assert cache.get("a1", lambda key: {"id": key}) == {"id": "a1"}
@@ -0,0 +1,121 @@
+import logging
+import os
+import pytest
+from flask import Flask
+from sqlalchemy import inspect, text
+from app.boot import BASELINE_REVISION, BootMarker, BootTimer, upgrade_schema
+from app.extension import db
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+@pytest.fixture
+def migrated_app(tmp_path):
+    from flask_migrate import Migrate
+
+    # env.py's fileConfig replaces the root handlers and disables loggers
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    loggers = [logger for logger in logging.Logger.manager.loggerDict.values()
+               if isinstance(logger, logging.Logger) and not logger.disabled]
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'schema.db'}"
+    db.init_app(app)
+    Migrate(app, db, directory=MIGRATIONS_DIR)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    for logger in loggers:
+        logger.disabled = False
+
+
+def alembic_revisions():
+    return db.session.execute(text("SELECT version_num FROM alembic_version")).scalars().all()
+
+
+def test_upgrade_builds_an_empty_database(migrated_app, tmp_path):
+    upgrade_schema(db)
+    head = BootMarker(str(tmp_path / "boot.json"), MIGRATIONS_DIR).head_revision()
+    assert alembic_revisions() == [head]
+
+
+def test_upgrade_stamps_an_unversioned_schema_at_the_baseline(migrated_app, tmp_path):
+    from flask_migrate import upgrade
+
+    # What create_all built before the migrations were tracked
+    upgrade(revision=BASELINE_REVISION)
+    db.session.execute(text("DROP TABLE alembic_version"))
+    db.session.commit()
+
+    upgrade_schema(db)
+    head = BootMarker(str(tmp_path / "boot.json"), MIGRATIONS_DIR).head_revision()
+    assert alembic_revisions() == [head]
+    columns = {column["name"] for column in inspect(db.engine).get_columns("submission")}
+    assert "user_id" in columns
+
+
+def test_schema_is_current_only_at_head(sqlite_app, tmp_path):
+    marker = BootMarker(str(tmp_path / "boot.json"), MIGRATIONS_DIR)
+    assert marker.schema_is_current(db) is False
+
+    db.session.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+    db.session.execute(text("INSERT INTO alembic_version VALUES ('3f1c2a9d5b10')"))
+    db.session.commit()
+    assert marker.schema_is_current(db) is False
+
+    db.session.execute(text("UPDATE alembic_version SET version_num = :head"), {"head": marker.head_revision()})
+    db.session.commit()
+    assert marker.schema_is_current(db) is True
+
+
+def test_marker_caches_head_and_seed_checksums(tmp_path):
+    path = str(tmp_path / "boot.json")
+    seed = tmp_path / "login.csv"
+    seed.write_text("id,first_name,last_name,email,password\n")
+
+    marker = BootMarker(path, MIGRATIONS_DIR)
+    head = marker.head_revision()
+    assert marker.seed_is_current(str(seed)) is False
+    marker.record_seed(str(seed))
+
+    reloaded = BootMarker(path, MIGRATIONS_DIR)
+    assert reloaded.data["head"] == head
+    assert reloaded.seed_is_current(str(seed)) is True
+    seed.write_text("changed\n")
+    assert reloaded.seed_is_current(str(seed)) is False
+
+
+def test_boot_timer_records_each_phase():
+    boot = BootTimer()
+    with boot.phase("config"):
+        pass
+    timings = boot.report()
+    assert set(timings) == {"config", "total"}
+
+
+def test_second_boot_of_a_created_schema_is_fast(tmp_path):
+    from config import Config
+    from app import create_app
+
+    class SQLiteConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'boot.db'}"
+        SQLALCHEMY_BINDS = {}
+        BOOT_MARKER_PATH = str(tmp_path / "boot.json")
+        OUTBOX_DISPATCHER_ENABLED = False
+
+    app = create_app(SQLiteConfig)
+    with app.app_context():
+        marker = BootMarker(SQLiteConfig.BOOT_MARKER_PATH, MIGRATIONS_DIR)
+        assert marker.schema_is_current(db) is True
+        db.engine.dispose()
+
+    # Only a fast boot records the seed, so the boot after it can skip seeding
+    app = create_app(SQLiteConfig)
+    with app.app_context():
+        db.engine.dispose()
+    assert BootMarker(SQLiteConfig.BOOT_MARKER_PATH, MIGRATIONS_DIR).seed_is_current("login.csv")
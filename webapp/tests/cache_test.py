@@ -0,0 +1,43 @@
+from app.cache import TTLCache, CredentialCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    clock.now = 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_credential_cache_hits_and_invalidation():
+    cache = CredentialCache(maxsize=10, ttl=60)
+    assert cache.get("nihal@gmail.com", "P@ssw0rd") is None
+    cache.set("nihal@gmail.com", "P@ssw0rd", 1)
+    assert cache.get("nihal@gmail.com", "P@ssw0rd") == 1
+    assert cache.get("nihal@gmail.com", "wrong") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+    cache.invalidate("nihal@gmail.com")
+    assert cache.get("nihal@gmail.com", "P@ssw0rd") is None
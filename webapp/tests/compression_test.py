@@ -0,0 +1,111 @@
+import gzip
+import json
+import pytest
+from flask import Flask, Response, jsonify, request
+from app.compression import ResponseCompressor, brotli
+from app.conditional import is_not_modified
+
+ROWS = [{"id": i, "name": f"assignment {i}"} for i in range(200)]
+ETAG = "abc123"
+
+
+def make_app(**config):
+    app = Flask(__name__)
+    app.config.update(COMPRESSION_MIN_SIZE=1024, **config)
+    ResponseCompressor().init_app(app)
+
+    @app.route("/large")
+    def large():
+        if is_not_modified(ETAG):
+            response = Response(status=304)
+        else:
+            response = jsonify(ROWS)
+        response.set_etag(ETAG)
+        return response
+
+    @app.route("/small")
+    def small():
+        return jsonify({"id": 1})
+
+    @app.route("/stream")
+    def stream():
+        return Response((json.dumps(row) + "\n" for row in ROWS), mimetype="application/json")
+
+    @app.route("/echo")
+    def echo():
+        return request.headers.get("Accept-Encoding", "")
+
+    return app.test_client()
+
+
+def test_gzip_is_negotiated_and_retagged():
+    client = make_app()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == f'"{ETAG}-gzip"'
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == ROWS
+
+    plain = client.get("/large")
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] == f'"{ETAG}"'
+    assert plain.json == ROWS
+
+
+def test_revalidation_matches_the_encoded_tag():
+    client = make_app()
+    response = client.get(
+        "/large", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{ETAG}-gzip"'}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{ETAG}-gzip"'
+
+    response = client.get("/large", headers={"If-None-Match": f'"{ETAG}"'})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{ETAG}"'
+
+    # A weak copy of the encoded tag, as proxies send back, still matches
+    response = client.get(
+        "/large", headers={"Accept-Encoding": "gzip", "If-None-Match": f'W/"{ETAG}-gzip"'}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{ETAG}-gzip"'
+
+
+def test_small_bodies_and_other_types_are_not_compressed():
+    client = make_app()
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    assert small.headers["Vary"] == "Accept-Encoding"
+
+    text = client.get("/echo", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in text.headers
+
+    refused = client.get("/large", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_streamed_bodies_are_compressed_incrementally():
+    client = make_app(COMPRESSION_ALGORITHMS="gzip")
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+
+
+@pytest.mark.skipif(brotli is None, reason="brotli is not installed")
+def test_brotli_preferred_unless_client_ranks_gzip_higher():
+    client = make_app()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.data)) == ROWS
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br;q=0.5"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        make_app(COMPRESSION_ALGORITHMS="gzip,zstd")
@@ -0,0 +1,28 @@
+from datetime import datetime
+import pytest
+from flask import Flask
+from app.conditional import assignment_etag, collection_etag, is_not_modified
+
+
+def test_assignment_etag_tracks_updates():
+    updated = datetime(2024, 1, 1, 10, 0, 0)
+    etag = assignment_etag("abc", updated)
+    assert etag == assignment_etag("abc", updated)
+    assert etag != assignment_etag("abc", datetime(2024, 1, 1, 10, 0, 1))
+    assert etag != assignment_etag("abd", updated)
+
+
+def test_collection_etag_tracks_version_and_variant():
+    etag = collection_etag(3)
+    assert etag == collection_etag(3)
+    assert etag != collection_etag(4)
+    assert etag != collection_etag(3, "limit=10")
+
+
+@pytest.mark.parametrize("header", ['W/"abc"', '"abc"', 'W/"abc-gzip"', '"x", W/"abc-br"'])
+def test_if_none_match_uses_weak_comparison(header):
+    app = Flask(__name__)
+    with app.test_request_context(headers={"If-None-Match": header}):
+        assert is_not_modified("abc") is True
+    with app.test_request_context(headers={"If-None-Match": header}):
+        assert is_not_modified("abd") is False
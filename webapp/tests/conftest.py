@@ -0,0 +1,22 @@
+import pytest
+from flask import Flask
+from app.extension import db
+
+
+@pytest.fixture
+def sqlite_config():
+    """Extra config for sqlite_app, modules override this fixture"""
+    return {}
+
+
+@pytest.fixture
+def sqlite_app(sqlite_config):
+    """Bare Flask app on an in-memory SQLite with every table created"""
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config.update(sqlite_config)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app import green
+from app.hashing import HashingPool
+
+WEBAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeBcrypt:
+    def check_password_hash(self, pw_hash, password):
+        return pw_hash == password
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        RecordingExecutor.created += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_hashing_pool_runs_on_the_configured_executor():
+    pool = HashingPool(FakeBcrypt(), workers=1, queue_depth=1)
+    assert pool.check_password_hash("a", "a") is True
+
+    pool.use_executor(RecordingExecutor)
+    assert pool.check_password_hash("a", "a") is True
+    assert pool.check_password_hash("a", "b") is False
+    assert RecordingExecutor.created == 1
+    pool.shutdown()
+
+
+def test_enable_refuses_an_unpatched_process():
+    assert green.is_patched() is False
+    with pytest.raises(RuntimeError, match="monkey patching"):
+        green.enable(HashingPool(FakeBcrypt()))
+
+
+def test_gevent_mode_serves_the_same_routes(tmp_path):
+    pytest.importorskip("gevent")
+    pytest.importorskip("psycogreen")
+    # Monkey patching is process wide, so the app runs in a child process
+    script = textwrap.dedent(f"""
+        from gevent import monkey
+        monkey.patch_all()
+        import json, logging
+        from benchmarks.http_load import boot
+
+        app = boot("sqlite:///{tmp_path / 'green.db'}", "gevent")
+        logging.getLogger().setLevel(logging.WARNING)
+        from app.extension import hashing_pool, health_prober
+        health_prober.probe()
+        client = app.test_client()
+        print(json.dumps({{
+            "healthz": client.get("/healthz").status_code,
+            "deep": client.get("/healthz/deep").status_code,
+            "unauthenticated": client.get("/v1/assignments").status_code,
+            "hash_executor": hashing_pool.executor_class.__module__,
+        }}))
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=WEBAPP_DIR, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == {
+        "healthz": 200,
+        "deep": 200,
+        "unauthenticated": 401,
+        "hash_executor": "gevent.threadpool",
+    }
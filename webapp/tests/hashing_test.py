@@ -0,0 +1,39 @@
+import threading
+import pytest
+from app.hashing import HashingPool, HashPoolSaturated
+
+
+class SlowBcrypt:
+    def __init__(self):
+        self.entered = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def check_password_hash(self, pw_hash, password):
+        self.entered.release()
+        self.release.wait(5)
+        return pw_hash == password
+
+
+def test_hashing_pool_rejects_when_queue_is_full():
+    bcrypt = SlowBcrypt()
+    pool = HashingPool(bcrypt, workers=2, queue_depth=0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.check_password_hash("a", "a")))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    # Both admitted jobs are running, so every slot is taken
+    for _ in threads:
+        assert bcrypt.entered.acquire(timeout=5), "hashing job never started"
+
+    with pytest.raises(HashPoolSaturated):
+        pool.check_password_hash("a", "a")
+
+    bcrypt.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results == [True, True]
+    assert pool.check_password_hash("a", "b") is False
+    pool.shutdown()
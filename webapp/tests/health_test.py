@@ -0,0 +1,70 @@
+import time
+import pytest
+from flask import Flask
+from app.extension import db
+from app.health import HealthProber, pool_stats
+
+
+BROKEN = "sqlite:////nonexistent/health.db"
+
+
+def make_app(uri="sqlite://", replica=None):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_BINDS"] = {"replica": replica} if replica else {}
+    app.config["HEALTH_PROBE_INTERVAL"] = 60
+    db.init_app(app)
+    return app
+
+
+@pytest.fixture
+def replica_bind():
+    yield
+    # init_app registers a metadata per bind key on the shared db object
+    db.metadatas.pop("replica", None)
+
+
+def test_prober_caches_result_and_detects_staleness():
+    app = make_app()
+    prober = HealthProber()
+    prober.init_app(app)
+    try:
+        status = prober.status()
+        assert status["healthy"] is True
+        assert prober.status()["checked_at"] == status["checked_at"]
+
+        prober.max_age = 0
+        time.sleep(0.01)
+        assert prober.status() == {**status, "healthy": False, "error": "stale"}
+    finally:
+        prober.stop()
+
+
+def test_pool_stats_reports_pool_class():
+    app = make_app()
+    with app.app_context():
+        assert "class" in pool_stats(db.engine)
+
+
+def test_broken_replica_leaves_the_primary_healthy(replica_bind):
+    prober = HealthProber()
+    prober.init_app(make_app(replica=BROKEN))
+    try:
+        status = prober.status()
+        assert status["healthy"] is True
+        assert status["replica"]["healthy"] is False
+        assert prober.replica_healthy() is False
+    finally:
+        prober.stop()
+
+
+def test_broken_primary_is_unhealthy_whatever_the_replica(replica_bind):
+    prober = HealthProber()
+    prober.init_app(make_app(uri=BROKEN, replica="sqlite://"))
+    try:
+        status = prober.status()
+        assert status["healthy"] is False
+        assert status["replica"]["healthy"] is True
+        assert prober.replica_healthy() is True
+    finally:
+        prober.stop()
@@ -0,0 +1,15 @@
+import json
+from app.helper_func import stream_json_array
+
+
+def test_stream_json_array_chunks():
+    items = ({"id": i} for i in range(5))
+    chunks = list(stream_json_array(items, chunk_size=2))
+    assert chunks[0] == "[" and chunks[-1] == "]"
+    assert len(chunks) == 5
+    assert json.loads("".join(chunks)) == [{"id": i} for i in range(5)]
+
+
+def test_stream_json_array_empty():
+    assert "".join(stream_json_array(iter(()))) == "[]"
+
@@ -0,0 +1,39 @@
+import random
+from benchmarks.http_load import Worker, compare, percentile, summarize
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_summarize_counts_errors_and_throughput():
+    results = summarize({"get_assignment": [(1.0, True), (3.0, False), (2.0, True)]}, duration=2)
+    assert results["get_assignment"] == {
+        "requests": 3, "errors": 1, "throughput_rps": 1.5,
+        "p50_ms": 2.0, "p95_ms": 3.0, "p99_ms": 3.0,
+    }
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    base = {"get_assignment": {"throughput_rps": 100, "p95_ms": 10, "errors": 0}}
+    within = {"get_assignment": {"throughput_rps": 85, "p95_ms": 11.9, "errors": 0}}
+    assert compare(within, base, 0.2) == []
+
+    slower = {"get_assignment": {"throughput_rps": 70, "p95_ms": 13, "errors": 2}}
+    assert len(compare(slower, base, 0.2)) == 3
+
+
+def test_updates_only_touch_the_workers_own_assignments():
+    worker = Worker(0, "bench@example.com", ["seeded"], random.Random(1))
+    name, method, path, _ = worker._request("update_assignment")
+    assert (name, method) == ("create_assignment", "POST")
+
+    worker.deletable.append("mine")
+    name, method, path, body = worker._request("update_assignment")
+    assert (name, method, path) == ("update_assignment", "PUT", "/v1/assignments/mine")
+    assert worker._request("create_submission")[2] == "/v1/assigments/seeded/submission"
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from benchmarks.import_time import DEFAULT_BUDGET_MS, WEBAPP_DIR, measure, report, total_ms
+
+
+def test_app_import_stays_within_budget():
+    entries = measure("app")
+    assert total_ms(entries) <= DEFAULT_BUDGET_MS, report(entries)
+
+
+def test_importing_the_app_builds_no_external_clients():
+    check = (
+        "import logging, sys\n"
+        "from app import extension\n"
+        "assert 'boto3' not in sys.modules\n"
+        "assert 'alembic' not in sys.modules\n"
+        "assert not extension.get_sns_client.built()\n"
+        "assert not extension.statsd.client_getter.built()\n"
+        "assert extension.log_pipeline is None and not logging.getLogger().handlers\n"
+    )
+    subprocess.run([sys.executable, "-c", check], cwd=WEBAPP_DIR, check=True)
@@ -0,0 +1,37 @@
+import threading
+from app.lazy import ProcessThread
+
+
+def test_process_thread_starts_once_and_restarts_after_stop():
+    runs = []
+
+    def target():
+        runs.append(threading.current_thread().name)
+        worker.stopping.wait(5)
+
+    worker = ProcessThread(target, "lazy-test")
+    worker.start()
+    worker.start()
+    assert worker.alive()
+
+    worker.stop()
+    worker._thread.join(timeout=5)
+    assert not worker.alive()
+    worker.start()
+    worker.stop()
+    worker._thread.join(timeout=5)
+    assert runs == ["lazy-test", "lazy-test"]
+
+
+def test_process_thread_restarts_in_a_forked_child(monkeypatch):
+    worker = ProcessThread(lambda: worker.stopping.wait(5), "lazy-test")
+    worker.start()
+    parent = worker._thread
+    # As seen from a child after fork: same handle, another pid
+    monkeypatch.setattr(worker, "_pid", -1)
+    assert not worker.alive()
+    worker.start()
+    assert worker._thread is not parent
+    worker.stop()
+    parent.join(timeout=5)
+    worker._thread.join(timeout=5)
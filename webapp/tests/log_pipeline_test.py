@@ -0,0 +1,41 @@
+import logging
+from app.log_pipeline import (
+    DroppingQueueHandler,
+    LogPipeline,
+    SamplingFilter,
+    parse_sample_rates,
+)
+
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_drops_when_full_without_blocking():
+    pipeline = LogPipeline([], maxsize=2)
+    handler = DroppingQueueHandler(pipeline)
+    for _ in range(5):
+        handler.emit(make_record())
+    assert pipeline.stats()["queue_depth"] == 2
+    assert pipeline.stats()["dropped"] == 3
+    assert pipeline.queue.get_nowait().msg == "hello world"
+
+
+def test_sampling_filter_only_thins_configured_levels():
+    sampler = SamplingFilter(parse_sample_rates("INFO=0"))
+    assert sampler.filter(make_record(logging.INFO)) is False
+    assert sampler.filter(make_record(logging.ERROR)) is True
+    assert sampler.sampled_out == 1
+
+
+def test_listener_writes_through_handlers():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(self.format(record))
+
+    pipeline = LogPipeline([ListHandler()]).start()
+    DroppingQueueHandler(pipeline).emit(make_record())
+    pipeline.stop()
+    assert records == ["hello world"]
@@ -0,0 +1,59 @@
+from flask import Flask, abort
+from statsd import StatsClient
+from app.metrics import PipelinedStatsClient, RequestMetrics
+
+
+class RecordingStatsClient(StatsClient):
+    def __init__(self):
+        super().__init__(prefix="webapp")
+        self.packets = []
+
+    def _send(self, data):
+        self.packets.append(data)
+
+
+def make_app(client):
+    statsd = PipelinedStatsClient(lambda: client)
+    app = Flask(__name__)
+    RequestMetrics(statsd).init_app(app)
+
+    @app.route("/items")
+    def list_items():
+        statsd.incr("auth.cache.hit")
+        return "x" * 10
+
+    @app.route("/missing")
+    def missing():
+        abort(404)
+
+    return app, statsd
+
+
+def test_request_stats_are_sent_as_one_packet():
+    client = RecordingStatsClient()
+    app, _ = make_app(client)
+    app.test_client().get("/items")
+
+    assert len(client.packets) == 1
+    stats = client.packets[0].split("\n")
+    assert "webapp.auth.cache.hit:1|c" in stats
+    assert "webapp.route.list_items.status.200:1|c" in stats
+    assert "webapp.route.list_items.response_bytes:10.000000|ms" in stats
+    assert any(s.startswith("webapp.route.list_items.time:") for s in stats)
+
+
+def test_error_status_is_counted_per_route():
+    client = RecordingStatsClient()
+    app, _ = make_app(client)
+    app.test_client().get("/missing")
+    app.test_client().get("/nope")
+
+    stats = "\n".join(client.packets).split("\n")
+    assert "webapp.route.missing.status.404:1|c" in stats
+    assert "webapp.route.unmatched.status.404:1|c" in stats
+
+
+def test_outside_a_request_stats_go_straight_out():
+    client = RecordingStatsClient()
+    PipelinedStatsClient(lambda: client).incr("outbox.published", 3)
+    assert client.packets == ["webapp.outbox.published:3|c"]
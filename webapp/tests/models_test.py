@@ -0,0 +1,17 @@
+from app.extension import db
+from app.models import SubmissionAttempt
+
+
+def test_claim_stops_at_max_attempts(sqlite_app):
+    assert SubmissionAttempt.claim("a1", 1, 2) == 1
+    assert SubmissionAttempt.claim("a1", 1, 2) == 2
+    assert SubmissionAttempt.claim("a1", 1, 2) is None
+    # Counted per user
+    assert SubmissionAttempt.claim("a1", 2, 2) == 1
+    db.session.commit()
+    assert db.session.get(SubmissionAttempt, ("a1", 1)).attempts == 2
+
+
+def test_claim_for_update_fallback(sqlite_app):
+    assert SubmissionAttempt._claim_for_update("a1", 1, 1) == 1
+    assert SubmissionAttempt._claim_for_update("a1", 1, 1) is None
@@ -0,0 +1,70 @@
+import pytest
+from app.extension import db
+from app.models import OutboxMessage
+from app.outbox import OutboxDispatcher
+
+
+class FakeSNS:
+    """Local stand-in for the SNS PublishBatch API"""
+
+    def __init__(self, fail_ids=(), error=None):
+        self.calls = []
+        self.fail_ids = set(fail_ids)
+        self.error = error
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        if self.error:
+            raise self.error
+        self.calls.append((TopicArn, PublishBatchRequestEntries))
+        return {
+            "Successful": [
+                {"Id": e["Id"]} for e in PublishBatchRequestEntries if e["Id"] not in self.fail_ids
+            ],
+            "Failed": [
+                {"Id": e["Id"], "Code": "InternalError"}
+                for e in PublishBatchRequestEntries if e["Id"] in self.fail_ids
+            ],
+        }
+
+
+@pytest.fixture
+def sqlite_config():
+    return {"OUTBOX_DISPATCHER_ENABLED": False}
+
+
+def make_dispatcher(app, sns):
+    dispatcher = OutboxDispatcher(db, lambda: sns)
+    dispatcher.init_app(app)
+    with app.app_context():
+        for i in range(23):
+            dispatcher.enqueue("arn:topic", f"message {i}")
+        db.session.commit()
+    return dispatcher
+
+
+def test_drain_publishes_in_batches_of_ten(sqlite_app):
+    sns = FakeSNS()
+    dispatcher = make_dispatcher(sqlite_app, sns)
+    assert dispatcher.drain_once() == 23
+    assert [len(entries) for _, entries in sns.calls] == [10, 10, 3]
+    with sqlite_app.app_context():
+        assert OutboxMessage.query.count() == 0
+
+
+def test_failed_entries_are_retried_with_backoff(sqlite_app):
+    sns = FakeSNS(fail_ids={"1", "2"})
+    dispatcher = make_dispatcher(sqlite_app, sns)
+    dispatcher.drain_once()
+    with sqlite_app.app_context():
+        left = OutboxMessage.query.order_by(OutboxMessage.id).all()
+        assert [m.id for m in left] == [1, 2]
+        assert all(m.attempts == 1 and m.next_attempt_at > m.created_at for m in left)
+    # Not due yet
+    assert dispatcher.drain_once() == 0
+
+
+def test_client_errors_keep_messages(sqlite_app):
+    dispatcher = make_dispatcher(sqlite_app, FakeSNS(error=ConnectionError("down")))
+    dispatcher.drain_once()
+    with sqlite_app.app_context():
+        assert OutboxMessage.query.filter(OutboxMessage.attempts == 1).count() == 23
@@ -0,0 +1,25 @@
+import pytest
+from datetime import datetime
+from app.pagination import ASSIGNMENT_FIELDS, decode_cursor, encode_cursor, parse_fields, parse_limit
+
+
+def test_cursor_round_trip():
+    created = datetime(2024, 1, 1, 12, 30, 0, 1234)
+    cursor = encode_cursor(created, "abc")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created, "abc")
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_parse_fields_and_limit():
+    assert parse_fields(None) == ASSIGNMENT_FIELDS
+    assert parse_fields("name, id,name") == ("name", "id")
+    with pytest.raises(ValueError):
+        parse_fields("id,password_hash")
+    assert parse_limit(None, 100, 1000) == 100
+    with pytest.raises(ValueError):
+        parse_limit("5000", 100, 1000)
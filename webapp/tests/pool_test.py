@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from app import pool
+from app.pool import InstrumentedQueuePool, engine_options
+
+
+class RecordingStatsd:
+    def __init__(self):
+        self.calls = []
+
+    def incr(self, name, count=1):
+        self.calls.append(("incr", name))
+
+    def timing(self, name, value):
+        self.calls.append(("timing", name, value))
+
+
+def test_engine_options_per_backend():
+    sqlite = engine_options({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+    assert "pool_size" not in sqlite and "connect_args" not in sqlite
+
+    postgres = engine_options({
+        "SQLALCHEMY_DATABASE_URI": "postgresql://u:p@db/app",
+        "DB_POOL_SIZE": 3,
+        "DB_STATEMENT_TIMEOUT_MS": 5000,
+        "SQLALCHEMY_ENGINE_OPTIONS": {"pool_recycle": 60},
+    })
+    assert postgres["pool_size"] == 3
+    assert postgres["poolclass"] is InstrumentedQueuePool
+    assert postgres["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert postgres["pool_recycle"] == 60
+
+
+def test_pool_reports_wait_usage_and_timeouts(monkeypatch, tmp_path):
+    statsd = RecordingStatsd()
+    monkeypatch.setattr(pool, "statsd", statsd)
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    connection = engine.connect()
+    assert [call[1] for call in statsd.calls] == [
+        "db.pool.checkout_wait", "db.pool.in_use", "db.pool.overflow",
+    ]
+    assert ("timing", "db.pool.in_use", 1) in statsd.calls
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert ("incr", "db.pool.timeout") in statsd.calls
+
+    # Nothing on return: it happens after the request's pipeline was sent
+    calls = len(statsd.calls)
+    connection.close()
+    assert len(statsd.calls) == calls
@@ -0,0 +1,49 @@
+from flask import Flask
+from sqlalchemy import create_engine, text
+from app.profiler import QueryProfile, SQLProfiler
+
+
+def make_app(**config):
+    engine = create_engine("sqlite://")
+    app = Flask(__name__)
+    app.config.update(SQL_PROFILER_ENABLED=True, **config)
+    SQLProfiler().init_app(app)
+
+    @app.route("/items")
+    def list_items():
+        with engine.connect() as connection:
+            for i in range(3):
+                connection.execute(text("SELECT :i"), {"i": i})
+            connection.execute(text("SELECT 42"))
+        return "ok"
+
+    return app
+
+
+def test_server_timing_reports_query_count():
+    response = make_app().test_client().get("/items")
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="4 queries"' in timing
+    assert "app;dur=" in timing
+
+
+def test_repeated_statements_are_logged(caplog):
+    app = make_app(SQL_PROFILER_REPEAT_THRESHOLD=3)
+    app.test_client().get("/items")
+    assert "SELECT ?" in caplog.text
+    assert "4 queries" in caplog.text
+
+
+def test_disabled_profiler_adds_nothing():
+    app = Flask(__name__)
+    SQLProfiler().init_app(app)
+    assert not app.before_request_funcs and not app.after_request_funcs
+
+
+def test_profile_keeps_the_slowest_statements():
+    profile = QueryProfile(top_n=2)
+    for elapsed_ms, statement in [(1, "a"), (9, "b"), (5, "c"), (2, "a")]:
+        profile.record(statement, elapsed_ms)
+    assert profile.slowest_statements() == [(9, "b"), (5, "c")]
+    assert profile.repeated(2) == {"a": 2}
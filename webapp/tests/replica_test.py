@@ -0,0 +1,105 @@
+import pytest
+from flask import Flask, g
+from sqlalchemy import func, select
+from app.extension import db
+from app.models import User
+from app.replica import PIN_COOKIE, ReplicaRouter
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+        SQLALCHEMY_BINDS={"replica": f"sqlite:///{tmp_path / 'replica.db'}"},
+    )
+    db.init_app(app)
+    router = ReplicaRouter()
+    router.init_app(app)
+
+    def count_users():
+        return str(db.session.scalar(select(func.count(User.id))))
+
+    @app.route("/read")
+    @router.read_only
+    def read():
+        g.user_id = 1
+        return count_users()
+
+    @app.route("/primary")
+    def primary():
+        return count_users()
+
+    @app.route("/cache-fill")
+    @router.read_only
+    def cache_fill():
+        with router.primary():
+            return count_users()
+
+    @app.route("/write", methods=["POST"])
+    def write():
+        g.user_id = 1
+        db.session.add(User(first_name="a", last_name="b", email="new@example.com", password_hash="x"))
+        db.session.commit()
+        return "", 201
+
+    with app.app_context():
+        for engine in db.engines.values():
+            db.metadata.create_all(engine)
+        db.session.add(User(first_name="a", last_name="b", email="a@example.com", password_hash="x"))
+        db.session.commit()
+    yield app
+    # init_app registers a metadata per bind key on the shared db object
+    db.metadatas.pop("replica", None)
+
+
+def test_read_only_routes_use_the_replica(app):
+    client = app.test_client()
+    assert client.get("/read").text == "0"
+    assert client.get("/primary").text == "1"
+
+
+def test_writer_is_pinned_to_the_primary(app):
+    client = app.test_client()
+    assert client.post("/write").status_code == 201
+    assert client.get_cookie(PIN_COOKIE) is not None
+    assert client.get("/read").text == "2"
+    # The pin travels with the client, not the worker that took the write
+    assert app.test_client().get("/read").text == "0"
+
+    client.delete_cookie(PIN_COOKIE)
+    assert client.get("/read").text == "0"
+
+
+def test_expired_or_garbled_pins_read_the_replica(app):
+    client = app.test_client()
+    for value in ("1", "soon"):
+        client.set_cookie(PIN_COOKIE, value)
+        assert client.get("/read").text == "0"
+
+
+def test_cache_fills_read_the_primary(app):
+    assert app.test_client().get("/cache-fill").text == "1"
+
+
+def test_without_a_replica_bind_nothing_is_routed():
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    router = ReplicaRouter()
+    router.init_app(app)
+    assert router.enabled is False and not app.after_request_funcs
+
+
+def test_reads_fall_back_to_the_primary_while_the_replica_is_down(app):
+    class Health:
+        healthy = False
+
+        def replica_healthy(self):
+            return self.healthy
+
+    router = app.extensions["replica_router"]
+    router.health = Health()
+    client = app.test_client()
+    assert client.get("/read").text == "1"
+    router.health.healthy = True
+    assert client.get("/read").text == "0"
@@ -0,0 +1,161 @@
+import base64
+from datetime import datetime, timedelta
+import pytest
+from config import Config
+from app import create_app
+from app.extension import assignment_cache, db, health_prober
+from app.models import Assignment
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"nihal@gmail.com:P@ssw0rd").decode()}
+DEADLINE = (datetime.utcnow() + timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+ASSIGNMENT = {"name": "Routes", "points": 10, "number_of_attempts": 2, "deadline": DEADLINE}
+
+
+def boot(tmp_path, **config):
+    class SQLiteConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'routes.db'}"
+        SQLALCHEMY_BINDS = {}
+        BOOT_MARKER_PATH = str(tmp_path / "boot.json")
+        OUTBOX_DISPATCHER_ENABLED = False
+        ASSIGNMENT_CACHE_BACKEND = "local"
+        # Seed users one per chunk, hashed in process at a cheap cost
+        SEED_CHUNK_SIZE = 1
+        BCRYPT_LOG_ROUNDS = 4
+
+    for name, value in config.items():
+        setattr(SQLiteConfig, name, value)
+    app = create_app(SQLiteConfig)
+    app.config["TESTING"] = True
+    return app
+
+
+def shutdown(app):
+    with app.app_context():
+        assignment_cache.clear()
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    health_prober.stop()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = boot(tmp_path)
+    yield app
+    shutdown(app)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def submit(client, ass_id):
+    return client.post(
+        f"/v1/assigments/{ass_id}/submission",
+        json={"submission_url": "https://example.com/a.zip"},
+        headers=AUTH,
+    )
+
+
+def test_submission_checks_the_row_not_a_stale_cache(app, client):
+    ass_id = client.post("/v1/assignments", json=ASSIGNMENT, headers=AUTH).json["id"]
+    # Warm this worker's cache, then change the row behind its back as
+    # another worker would
+    assert client.get(f"/v1/assignments/{ass_id}", headers=AUTH).status_code == 200
+    with app.app_context():
+        db.session.get(Assignment, ass_id).number_of_attempts = 1
+        db.session.commit()
+
+    assert submit(client, ass_id).status_code == 201
+    response = submit(client, ass_id)
+    assert response.status_code == 400
+    assert b"No attempts left" in response.data
+
+    with app.app_context():
+        db.session.get(Assignment, ass_id).deadline = datetime.utcnow() - timedelta(days=1)
+        db.session.commit()
+    response = submit(client, ass_id)
+    assert response.status_code == 400
+    assert b"Deadline has passed" in response.data
+
+
+def test_submission_to_a_missing_assignment_is_404(client):
+    assert submit(client, "missing").status_code == 404
+
+
+def assignment_count(app):
+    with app.app_context():
+        return db.session.query(Assignment).count()
+
+
+def test_bulk_atomic_rejects_the_whole_batch(app, client):
+    batch = [ASSIGNMENT, {**ASSIGNMENT, "points": 101}, ASSIGNMENT]
+    response = client.post("/v1/assignments/bulk", json=batch, headers=AUTH)
+    assert response.status_code == 400
+    assert [result["status"] for result in response.json] == [424, 400, 424]
+    assert response.json[1]["errors"] == {"points": "Points must between 1 and 100"}
+    assert assignment_count(app) == 0
+
+
+def test_bulk_partial_inserts_only_the_valid_rows(app, client):
+    batch = [ASSIGNMENT, {**ASSIGNMENT, "deadline": "tomorrow"}, {**ASSIGNMENT, "name": "Second"}]
+    response = client.post("/v1/assignments/bulk?mode=partial", json=batch, headers=AUTH)
+    assert response.status_code == 207
+    assert [result["status"] for result in response.json] == [201, 400, 201]
+    created = [result["assignment"]["id"] for result in response.json if result["status"] == 201]
+    with app.app_context():
+        names = dict(db.session.query(Assignment.id, Assignment.name))
+    assert names == {created[0]: "Routes", created[1]: "Second"}
+
+
+def test_bulk_valid_batch_is_created(app, client):
+    response = client.post("/v1/assignments/bulk", json=[ASSIGNMENT] * 3, headers=AUTH)
+    assert response.status_code == 201
+    assert [result["status"] for result in response.json] == [201] * 3
+    assert assignment_count(app) == 3
+
+
+def test_bulk_enforces_the_batch_cap(app, client):
+    app.config["ASSIGNMENTS_BULK_MAX"] = 2
+    response = client.post("/v1/assignments/bulk", json=[ASSIGNMENT] * 3, headers=AUTH)
+    assert response.status_code == 400
+    assert b"At most 2 assignments" in response.data
+    assert assignment_count(app) == 0
+
+
+@pytest.mark.parametrize("body", [ASSIGNMENT, [], "assignments", 3])
+def test_bulk_needs_a_non_empty_array(app, client, body):
+    response = client.post("/v1/assignments/bulk", json=body, headers=AUTH)
+    assert response.status_code == 400
+    assert b"non-empty array" in response.data
+    assert assignment_count(app) == 0
+
+
+def test_bulk_rejects_an_unknown_mode(client):
+    response = client.post("/v1/assignments/bulk?mode=best", json=[ASSIGNMENT], headers=AUTH)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("query", ["", "?stream=true", "?fields=id,name"])
+def test_an_empty_page_is_an_empty_array(client, query):
+    response = client.get(f"/v1/assignments{query}", headers=AUTH)
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.json == []
+    assert response.headers["ETag"]
+
+
+def test_healthz_follows_the_primary_not_a_broken_replica(tmp_path):
+    app = boot(tmp_path, SQLALCHEMY_BINDS={"replica": "sqlite:////nonexistent/replica.db"})
+    try:
+        client = app.test_client()
+        assert client.get("/healthz").status_code == 200
+        deep = client.get("/healthz/deep")
+        assert deep.status_code == 200
+        assert deep.json["replica"]["healthy"] is False
+        # Reads fall back to the primary while the replica is down
+        assert client.get("/v1/assignments", headers=AUTH).status_code == 200
+    finally:
+        shutdown(app)
+        db.metadatas.pop("replica", None)
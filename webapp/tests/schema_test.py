@@ -0,0 +1,65 @@
+from datetime import datetime
+import pytest
+from app.helper_func import is_valid_email, is_valid_password
+from app.schema import ASSIGNMENT_SCHEMA, SUBMISSION_SCHEMA, Field, describe, parse_datetime
+
+PAYLOAD = {
+    "name": "a",
+    "points": 10,
+    "number_of_attempts": 3,
+    "deadline": "2030-01-01T00:00:00.5Z",
+}
+
+
+def test_parse_datetime_accepts_only_the_api_format():
+    assert parse_datetime("2030-01-01T10:20:30.123456Z") == datetime(2030, 1, 1, 10, 20, 30, 123456)
+    assert parse_datetime("2030-01-01T00:00:00.5Z") == datetime(2030, 1, 1, 0, 0, 0, 500000)
+    for value in ("2030-01-01", "2030-01-01T00:00:00Z", "2030-13-01T00:00:00.000Z", "2030-01-01T00:00:00.000"):
+        assert parse_datetime(value) is None
+
+
+def test_assignment_schema_collects_every_error():
+    values, errors = ASSIGNMENT_SCHEMA.validate(PAYLOAD)
+    assert errors is None
+    assert values["deadline"] == datetime(2030, 1, 1, 0, 0, 0, 500000)
+
+    values, errors = ASSIGNMENT_SCHEMA.validate(
+        {"points": True, "number_of_attempts": 101, "deadline": "tomorrow"}
+    )
+    assert values is None
+    assert errors == {
+        "name": "Missing required fields",
+        "points": "Points must between 1 and 100",
+        "number_of_attempts": "No of attempts must between 1 and 100",
+        "deadline": "Invalid Deadline format",
+    }
+    assert ASSIGNMENT_SCHEMA.validate([])[1] == {"_schema": "Assignment must be a JSON object"}
+
+
+def test_assignment_schema_describes_a_single_error():
+    def error(**changes):
+        return describe(ASSIGNMENT_SCHEMA.validate({**PAYLOAD, **changes})[1])
+
+    assert error(points=101) == "Points must between 1 and 100"
+    assert error(points="10") == "Points must between 1 and 100"
+    assert error(deadline="2030-01-01") == "Invalid Deadline format"
+
+
+def test_field_is_abstract():
+    with pytest.raises(TypeError):
+        Field("name", "message")
+
+
+def test_submission_schema_and_describe():
+    assert SUBMISSION_SCHEMA.validate({"submission_url": "https://x.io/a.zip"})[0] == {"submission_url": "https://x.io/a.zip"}
+    errors = SUBMISSION_SCHEMA.validate({"submission_url": ""})[1]
+    assert describe(errors) == "Missing required fields"
+    assert describe({"a": "x", "b": "x", "c": "y"}) == "x; y"
+
+
+def test_credential_checks():
+    assert is_valid_email("nihal@gmail.com")
+    assert not is_valid_email("nihal@gmail")
+    assert is_valid_password("P@ssw0rd")
+    for password in ("P@ss0", "p@ssw0rd", "P@SSW0RD", "P@ssword", "Passw0rd"):
+        assert not is_valid_password(password)
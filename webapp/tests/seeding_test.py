@@ -0,0 +1,45 @@
+import pytest
+from flask_bcrypt import check_password_hash
+from app.extension import db
+from app.models import User
+from app.seeding import load_users_from_csv
+
+ROWS = """id,first_name,last_name,email,password
+1,Nihal,Gajbhiye,nihal@gmail.com,P@ssw0rd
+2,Sunny,Gajbhiye,sunny@gmail.com,P@ssw0rd
+3,Sunny,Again,sunny@gmail.com,P@ssw0rd
+4,Bad,Password,bad@gmail.com,password
+5,Asha,Rao,asha@gmail.com,S3cret!x
+"""
+
+
+@pytest.fixture
+def sqlite_config():
+    return {"BCRYPT_LOG_ROUNDS": 4, "SEED_CHUNK_SIZE": 2, "SEED_HASH_WORKERS": 2}
+
+
+def test_seeds_new_valid_users_once(sqlite_app, tmp_path):
+    path = tmp_path / "login.csv"
+    path.write_text(ROWS)
+    db.session.add(User(first_name="Asha", last_name="Rao", email="asha@gmail.com", password_hash="x"))
+    db.session.commit()
+
+    assert load_users_from_csv(str(path)) == 2
+    users = {user.email: user for user in User.query}
+    assert set(users) == {"nihal@gmail.com", "sunny@gmail.com", "asha@gmail.com"}
+    assert users["asha@gmail.com"].password_hash == "x"
+    assert check_password_hash(users["sunny@gmail.com"].password_hash, "P@ssw0rd")
+
+
+def test_unchanged_file_is_skipped(sqlite_app, tmp_path):
+    path = tmp_path / "login.csv"
+    path.write_text(ROWS)
+    assert load_users_from_csv(str(path)) == 3
+    User.query.delete()
+    db.session.commit()
+
+    assert load_users_from_csv(str(path)) == 0
+    assert User.query.count() == 0
+
+    path.write_text(ROWS + "6,New,User,new@gmail.com,P@ssw0rd\n")
+    assert load_users_from_csv(str(path)) == 4
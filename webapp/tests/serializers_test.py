@@ -0,0 +1,64 @@
+import json
+from datetime import datetime
+import pytest
+from flask import Flask, jsonify
+from app import serializers
+from app.models import Assignment
+from app.serializers import FastJSONProvider, RowSerializer, dumps, orjson, row_serializer
+
+
+def test_row_serializer_formats_datetime_columns():
+    serialize = row_serializer(Assignment, ("id", "deadline", "assignment_updated"))
+    row = ("a1", datetime(2030, 1, 1, 8, 30), None)
+    assert serialize(row) == {
+        "id": "a1",
+        "deadline": "2030-01-01T08:30:00",
+        "assignment_updated": None,
+    }
+
+
+def test_row_serializer_ignores_trailing_columns():
+    serialize = RowSerializer(("id",))
+    assert serialize(("a1", "keyset", "columns")) == {"id": "a1"}
+
+
+def test_fast_provider_matches_default_output():
+    app = Flask(__name__)
+    data = [{"b": 1, "a": "xé"}, {"c": None}]
+    assert json.loads(FastJSONProvider(app).dumps(data)) == data
+    assert dumps(data) == '[{"a":"xé","b":1},{"c":null}]'
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+@pytest.mark.parametrize("debug", [False, True])
+def test_jsonify_encodes_with_orjson(monkeypatch, debug):
+    calls = []
+
+    class CountingOrjson:
+        def __getattr__(self, name):
+            return getattr(orjson, name)
+
+        def dumps(self, *args, **kwargs):
+            calls.append(args)
+            return orjson.dumps(*args, **kwargs)
+
+    monkeypatch.setattr(serializers, "orjson", CountingOrjson())
+    data = {"b": [1, None], "a": "x", "when": datetime(2030, 1, 1, 8, 30)}
+    default_app = Flask(__name__)
+    default_app.debug = debug
+    app = Flask(__name__)
+    app.debug = debug
+    app.json = FastJSONProvider(app)
+
+    with app.app_context():
+        body = jsonify(data).get_data()
+    with default_app.app_context():
+        expected = jsonify(data).get_data()
+
+    assert calls
+    assert body == expected
+
+    # UTF-8 where the stdlib escapes, the same document
+    with app.app_context():
+        body = jsonify({"a": "xé"}).get_data()
+    assert json.loads(body) == {"a": "xé"}
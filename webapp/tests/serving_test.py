@@ -0,0 +1,50 @@
+import pytest
+from config import Config
+from serving import autotune, available_memory_mb, rss_mb, server_settings
+
+
+def test_autotune_fills_cpus_within_memory():
+    # t2.micro: 1 vCPU, about 600 MB free after the OS
+    assert autotune("sync", 1, 600, 150, 5) == (3, 5)
+    assert autotune("sync", 4, 600, 150, 5) == (4, 5)
+    assert autotune("sync", 4, None, 150, 5) == (9, 5)
+    assert autotune("gevent", 2, 4096, 150, 5) == (2, 1)
+    # Never zero workers, even when nothing fits
+    assert autotune("sync", 2, 100, 150, 5) == (1, 5)
+
+
+def test_server_settings_prefers_explicit_counts():
+    class Tuned(Config):
+        SERVING_MODE = "sync"
+        SERVER_WORKERS = 0
+        SERVER_THREADS = 8
+
+    settings = server_settings(Tuned, cpus=2, memory_mb=2048)
+    assert settings["worker_class"] == "gthread"
+    assert settings["workers"] == 5
+    assert settings["threads"] == 8
+    assert settings["preload_app"] is Config.SERVER_PRELOAD
+
+
+def test_gevent_workers_are_not_preloaded():
+    class Green(Config):
+        SERVING_MODE = "gevent"
+        SERVER_PRELOAD = True
+
+    settings = server_settings(Green, cpus=1, memory_mb=1024)
+    assert settings["worker_class"] == "gevent"
+    assert settings["preload_app"] is False
+
+    class Unknown(Config):
+        SERVING_MODE = "asyncio"
+
+    with pytest.raises(ValueError):
+        server_settings(Unknown, cpus=1, memory_mb=1024)
+
+
+def test_proc_readers(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal:        1006380 kB\nMemAvailable:     614400 kB\n")
+    assert available_memory_mb(str(meminfo)) == 600
+    assert available_memory_mb(str(tmp_path / "missing")) is None
+    assert rss_mb(pid="0-no-such-pid") is None
@@ -0,0 +1,28 @@
+"""Migrate the database to the head revision, before the app starts.
+
+    python upgrade.py
+
+Run by systemd as the app service's ExecStartPre, so no worker boots on
+an old schema. Deliberately not through create_app: nothing may touch the
+schema before the migrations do.
+"""
+from flask import Flask
+from flask_migrate import Migrate
+from config import Config
+from app import models  # noqa: F401, registers the tables on db.metadata
+from app.boot import upgrade_schema
+from app.extension import db, setup_logging
+
+
+def main():
+    setup_logging()
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    Migrate(app, db)
+    with app.app_context():
+        upgrade_schema(db)
+
+
+if __name__ == "__main__":
+    main()
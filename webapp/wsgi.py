@@ -1,5 +1,7 @@
+"""WSGI entry point, served in production by gunicorn with gunicorn.conf.py"""
 from app import create_app
 
 app = create_app()
 if __name__ == "__main__":
+    # Local development server only
     app.run(debug=True)
\ No newline at end of file